@@ -0,0 +1,84 @@
+"""Per-movie review count, score sum and label counts (table movie_stats).
+
+Updated incrementally through backend.hooks; rebuild() recomputes everything
+from the reviews table to repair drift.
+"""
+from collections import defaultdict
+from typing import Iterable, List
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from backend import versions
+from backend.db import MovieStats, Review
+
+LABEL_COLUMNS = {
+    "positive": "positive_count",
+    "neutral": "neutral_count",
+    "negative": "negative_count",
+}
+
+
+def counted():
+    """Reviews that contribute to aggregates: everything except unscored write-behind rows."""
+    return Review.sentiment_status.is_(None) | (Review.sentiment_status == "done")
+
+
+def apply(db: Session, reviews: Iterable, sign: int = 1) -> None:
+    deltas = defaultdict(lambda: defaultdict(float))
+    for review in reviews:
+        delta = deltas[review.movie_id]
+        delta["review_count"] += sign
+        delta["score_sum"] += sign * review.score
+        column = LABEL_COLUMNS.get(review.label or "")
+        if column:
+            delta[column] += sign
+
+    for movie_id, delta in deltas.items():
+        values = {name: getattr(MovieStats, name) + amount for name, amount in delta.items()}
+        result = db.execute(update(MovieStats).where(MovieStats.movie_id == movie_id).values(**values))
+        if result.rowcount == 0 and sign > 0:
+            db.execute(
+                insert(MovieStats).values(
+                    movie_id=movie_id,
+                    review_count=int(delta["review_count"]),
+                    score_sum=delta["score_sum"],
+                    **{name: int(delta[name]) for name in LABEL_COLUMNS.values()},
+                )
+            )
+
+
+def drop(db: Session, movie_ids: List[int]) -> None:
+    db.execute(delete(MovieStats).where(MovieStats.movie_id.in_(movie_ids)))
+
+
+def get(db: Session, movie_id: int) -> MovieStats | None:
+    return db.get(MovieStats, movie_id)
+
+
+def rebuild(db: Session) -> int:
+    """Recompute movie_stats from scratch in one transaction. Returns the number of movies."""
+    db.execute(delete(MovieStats))
+    label_sums = [func.sum(case((Review.sentiment_label == label, 1), else_=0)) for label in LABEL_COLUMNS]
+    grouped = (
+        select(Review.movie_id, func.count(Review.id), func.sum(Review.sentiment_score), *label_sums)
+        .where(counted())
+        .group_by(Review.movie_id)
+    )
+    db.execute(
+        insert(MovieStats).from_select(
+            ["movie_id", "review_count", "score_sum", *LABEL_COLUMNS.values()],
+            grouped,
+        )
+    )
+    versions.bump_all(db)
+    db.commit()
+    return db.scalar(select(func.count()).select_from(MovieStats))
+
+
+def ensure_initialized(db: Session) -> None:
+    """Populate movie_stats the first time it exists next to an already populated reviews table."""
+    if db.scalar(select(func.count()).select_from(MovieStats)) == 0 and db.scalar(
+        select(func.count(Review.id)).where(counted())
+    ):
+        rebuild(db)
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session
 
-from backend import models
-from backend.db import Movie, get_db
+from backend import hooks, http_cache, models, pagination, posters, serialization, versions
+from backend.db import Movie, MovieStats, Review, get_db
 
 router = APIRouter()
 
@@ -11,29 +15,173 @@ router = APIRouter()
 def create_movie(movie_create: models.MovieCreate, db: Session = Depends(get_db)):
     movie = Movie(**movie_create.model_dump())
     db.add(movie)
+    db.flush()
+    hooks.movie_added(db, movie)
     db.commit()
     db.refresh(movie)
     return movie
 
 
 @router.get("/", response_model=list[models.Movie])
-def list_movies(db: Session = Depends(get_db)):
-    return db.query(Movie).all()
+def list_movies(
+    request: Request,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """One page of movies by id; the next page's cursor is in the X-Next-Cursor header."""
+    size = pagination.page_size(page_size)
+
+    def build(headers):
+        query = select(*serialization.MOVIE_COLUMNS).order_by(Movie.id)
+        if cursor:
+            (last_id,) = pagination.decode_cursor(cursor, (int,))
+            query = query.where(Movie.id > last_id)
+        rows = db.execute(query.limit(size + 1)).all()
+        return serialization.as_dicts(pagination.trim_page(headers, rows, size, lambda m: [m.id]))
+
+    return http_cache.conditional(request, db, [versions.MOVIES], build)
+
+
+@router.get("/summary", response_model=list[models.MovieSummary])
+def movies_summary(
+    request: Request,
+    reviews_per_movie: int = Query(3, ge=0, le=20),
+    ids: list[int] | None = Query(None, description="only these movies, e.g. search hits"),
+    cursor: str | None = None,
+    page_size: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """One page of movies by id with rating aggregates and latest reviews, in two queries total.
+
+    The next page's cursor is in the X-Next-Cursor header.
+    """
+    size = pagination.page_size(page_size)
+
+    def build(headers):
+        last_id = pagination.decode_cursor(cursor, (int,))[0] if cursor else None
+        return _summaries(db, headers, reviews_per_movie, ids, size, last_id)
+
+    return http_cache.conditional(request, db, [versions.MOVIES, versions.REVIEWS], build)
+
+
+def _summaries(
+    db: Session, headers, reviews_per_movie: int, ids: list[int] | None, size: int, last_id: int | None
+) -> list[dict]:
+    stats_columns = (
+        MovieStats.review_count,
+        MovieStats.score_sum,
+        MovieStats.positive_count,
+        MovieStats.neutral_count,
+        MovieStats.negative_count,
+    )
+    query = select(*serialization.MOVIE_COLUMNS, *stats_columns).outerjoin(MovieStats, MovieStats.movie_id == Movie.id)
+    if ids:
+        query = query.where(Movie.id.in_(ids))
+    if last_id is not None:
+        query = query.where(Movie.id > last_id)
+    rows = db.execute(query.order_by(Movie.id).limit(size + 1)).all()
+    rows = pagination.trim_page(headers, rows, size, lambda m: [m.id])
+
+    recent = {}
+    if reviews_per_movie and rows:
+        # top K per movie: number each movie's reviews newest-first and keep the first K;
+        # only this page's movies are ranked, so the cost follows the page, not the whole table
+        rank = (
+            func.row_number()
+            .over(partition_by=Review.movie_id, order_by=(Review.created_at.desc(), Review.id.desc()))
+            .label("rank")
+        )
+        ranked = select(Review.id, rank).where(Review.movie_id.in_([row.id for row in rows])).subquery()
+        latest = (
+            select(*serialization.REVIEW_COLUMNS)
+            .join(ranked, ranked.c.id == Review.id)
+            .where(ranked.c.rank <= reviews_per_movie)
+            .order_by(Review.movie_id, ranked.c.rank)
+        )
+        for review in serialization.as_dicts(db.execute(latest)):
+            recent.setdefault(review["movie_id"], []).append(review)
+
+    # same shape as models.MovieSummary
+    summaries = []
+    for row in rows:
+        count = row.review_count or 0
+        summary = {column.key: getattr(row, column.key) for column in serialization.MOVIE_COLUMNS}
+        summary.update(
+            average_sentiment=(row.score_sum / count) if count else None,
+            review_count=count,
+            label_counts={
+                "positive": row.positive_count or 0,
+                "neutral": row.neutral_count or 0,
+                "negative": row.negative_count or 0,
+            },
+            recent_reviews=recent.get(row.id, []),
+        )
+        summaries.append(summary)
+    return summaries
 
 
 @router.get("/{movie_id}", response_model=models.Movie)
-def get_movie(movie_id: int, db: Session = Depends(get_db)):
-    movie = db.query(Movie).filter(Movie.id == movie_id).first()
-    if not movie:
-        raise HTTPException(status_code=404, detail="Movie not found")
-    return movie
+def get_movie(movie_id: int, request: Request, db: Session = Depends(get_db)):
+    def build(headers):
+        movie = db.query(Movie).filter(Movie.id == movie_id).first()
+        if not movie:
+            raise HTTPException(status_code=404, detail="Movie not found")
+        return models.Movie.model_validate(movie, from_attributes=True).model_dump(mode="json")
+
+    return http_cache.conditional(request, db, [versions.MOVIES], build)
+
+
+@router.get("/{movie_id}/poster")
+def get_poster(
+    movie_id: int,
+    w: int = Query(posters.DEFAULT_WIDTH, ge=16, le=2000, description=f"snapped up to one of {posters.WIDTHS}"),
+    format: Literal["webp", "jpeg"] = "webp",
+    db: Session = Depends(get_db),
+):
+    """Resized poster from the on-disk cache; the original is fetched from poster_url once."""
+    movie = db.get(Movie, movie_id)
+    poster_url = movie.poster_url if movie else None
+    # don't hold a pooled connection while a slow poster host answers
+    db.close()
+    return poster_response(poster_url, w, format)
+
+
+def poster_response(poster_url: str | None, width: int, fmt: str):
+    if not poster_url:
+        raise HTTPException(status_code=404, detail="Movie has no poster")
+    try:
+        image = posters.thumbnail(poster_url, width, fmt)
+    except posters.PosterUnavailable as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
+    if image is None:
+        return RedirectResponse(poster_url)
+    return Response(image, media_type=posters.FORMATS[fmt][1], headers={"Cache-Control": posters.CACHE_CONTROL})
+
+
+@router.delete("/", response_model=dict)
+def delete_movies(ids: list[int] = Query(..., description="movies to delete"), db: Session = Depends(get_db)):
+    """Delete several movies with all their reviews; unknown ids are reported, not an error."""
+    ids = list(dict.fromkeys(ids))
+    found = list(db.scalars(select(Movie.id).where(Movie.id.in_(ids))))
+    _delete_movies(db, found)
+    db.commit()
+    return {"deleted": found, "missing": sorted(set(ids) - set(found))}
 
 
 @router.delete("/{movie_id}", response_model=dict)
 def delete_movie(movie_id: int, db: Session = Depends(get_db)):
-    movie = db.query(Movie).filter(Movie.id == movie_id).first()
-    if not movie:
+    if db.get(Movie, movie_id) is None:
         raise HTTPException(status_code=404, detail="Movie not found")
-    db.delete(movie)
+    _delete_movies(db, [movie_id])
     db.commit()
     return {"ok": True}
+
+
+def _delete_movies(db: Session, movie_ids: list[int]) -> None:
+    """A fixed number of statements however many reviews there are: reviews and their
+    scoring jobs go with the movie rows through ON DELETE CASCADE."""
+    if not movie_ids:
+        return
+    hooks.movies_deleted(db, movie_ids)
+    db.execute(delete(Movie).where(Movie.id.in_(movie_ids)), execution_options={"synchronize_session": False})
@@ -0,0 +1,84 @@
+"""/movies routes on AsyncSession, mounted instead of backend.api.movies when DATABASE_URL uses an async driver.
+
+The handlers await the database on the event loop instead of holding a
+threadpool thread for the whole request. The query and write logic is the sync
+implementation, run against the async session's sync facade with run_sync, so
+both modes return the same responses and keep hooks/caches in step.
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models, posters
+from backend.api import movies
+from backend.db import Movie, get_async_db
+
+router = APIRouter()
+
+
+def run_sync(db: AsyncSession, handler, *args, **kwargs):
+    """Await a sync route handler of backend.api with the session's sync facade as its db."""
+    return db.run_sync(lambda session: handler(*args, db=session, **kwargs))
+
+
+@router.post("/", response_model=models.Movie)
+async def create_movie(movie_create: models.MovieCreate, db: AsyncSession = Depends(get_async_db)):
+    return await run_sync(db, movies.create_movie, movie_create)
+
+
+@router.get("/", response_model=list[models.Movie])
+async def list_movies(
+    request: Request,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """One page of movies by id; the next page's cursor is in the X-Next-Cursor header."""
+    return await run_sync(db, movies.list_movies, request, cursor, page_size)
+
+
+@router.get("/summary", response_model=list[models.MovieSummary])
+async def movies_summary(
+    request: Request,
+    reviews_per_movie: int = Query(3, ge=0, le=20),
+    ids: list[int] | None = Query(None, description="only these movies, e.g. search hits"),
+    cursor: str | None = None,
+    page_size: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """One page of movies by id with rating aggregates and latest reviews, in two queries total."""
+    return await run_sync(db, movies.movies_summary, request, reviews_per_movie, ids, cursor, page_size)
+
+
+@router.get("/{movie_id}", response_model=models.Movie)
+async def get_movie(movie_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await run_sync(db, movies.get_movie, movie_id, request)
+
+
+@router.get("/{movie_id}/poster")
+async def get_poster(
+    movie_id: int,
+    w: int = Query(posters.DEFAULT_WIDTH, ge=16, le=2000, description=f"snapped up to one of {posters.WIDTHS}"),
+    format: Literal["webp", "jpeg"] = "webp",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Resized poster from the on-disk cache; the original is fetched from poster_url once."""
+    movie = await db.get(Movie, movie_id)
+    # fetching and resizing block, so they run in the threadpool
+    return await run_in_threadpool(movies.poster_response, movie.poster_url if movie else None, w, format)
+
+
+@router.delete("/", response_model=dict)
+async def delete_movies(
+    ids: list[int] = Query(..., description="movies to delete"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Delete several movies with all their reviews; unknown ids are reported, not an error."""
+    return await run_sync(db, movies.delete_movies, ids)
+
+
+@router.delete("/{movie_id}", response_model=dict)
+async def delete_movie(movie_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await run_sync(db, movies.delete_movie, movie_id)
@@ -1,72 +1,265 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import os
+from datetime import date, datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from backend import models, sentiment
-from backend.db import Movie, Review, get_db
+from backend import (
+    aggregates,
+    group_commit,
+    hooks,
+    http_cache,
+    models,
+    pagination,
+    scoring_queue,
+    sentiment,
+    serialization,
+    trends,
+    versions,
+)
+from backend.db import Movie, Review, ScoringJob, get_db
+from backend.ingest import ReviewIngester
 
 router = APIRouter()
 
+# how long a review write waits for the model to finish loading before answering 503
+READY_TIMEOUT = float(os.getenv("SENTIMENT_READY_TIMEOUT", "10"))
+# a JSON array is parsed in one piece, so its body is capped; NDJSON streams and has no cap
+BULK_JSON_MAX_BYTES = int(float(os.getenv("BULK_JSON_MAX_MB", "10")) * 1024 * 1024)
+
+
+def _require_model() -> None:
+    if not sentiment.wait_until_ready(READY_TIMEOUT):
+        raise HTTPException(
+            status_code=503,
+            detail="Sentiment model is warming up, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
 
 @router.post("/", response_model=models.Review)
-def create_review(payload: models.ReviewCreate, db: Session = Depends(get_db)):
+def create_review(payload: models.ReviewCreate, response: Response, db: Session = Depends(get_db)):
     movie = db.query(Movie).filter(Movie.id == payload.movie_id).first()
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
 
+    if scoring_queue.ASYNC_WRITES:
+        # write-behind: store now, score later; poll /reviews/{id}/status
+        try:
+            review = scoring_queue.enqueue_review(db, payload)
+        except scoring_queue.QueueFull:
+            raise HTTPException(
+                status_code=429, detail="Too many reviews waiting for scoring", headers={"Retry-After": "10"}
+            )
+        response.status_code = 202
+        return review
+
+    _require_model()
     score, label = sentiment.analyze(payload.content)
+    if group_commit.ENABLED:
+        review_id = group_commit.get_committer().submit(lambda s: _insert_review(s, payload, score, label))
+        return db.get(Review, review_id)
+
+    review_id = _insert_review(db, payload, score, label)
+    db.commit()
+    return db.get(Review, review_id)
+
+
+def _insert_review(db: Session, payload: models.ReviewCreate, score: float, label: str) -> int:
     review = Review(
         movie_id=payload.movie_id,
         author=payload.author,
         content=payload.content,
         sentiment_score=score,
         sentiment_label=label,
+        sentiment_model=sentiment.model_tag(),
+        sentiment_status="done",
     )
-
     db.add(review)
+    db.flush()
+    hooks.reviews_added(db, [(review.id, review.movie_id, review.content)])
+    hooks.reviews_scored(db, [hooks.ScoredReview(review.id, review.movie_id, score, label, review.created_at)])
+    return review.id
+
+
+@router.post("/bulk")
+async def create_reviews_bulk(request: Request, db: Session = Depends(get_db)):
+    """Import many reviews from an NDJSON stream (application/x-ndjson) or a JSON array.
+
+    Invalid rows are reported by 1-based row number and do not abort the import.
+    A JSON array is limited to BULK_JSON_MAX_BYTES (413 beyond); use NDJSON for large imports.
+    """
+    await run_in_threadpool(_require_model)
+    ingester = ReviewIngester(db)
+
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            records = json.loads(await _limited_body(request, BULK_JSON_MAX_BYTES))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {exc}")
+        if not isinstance(records, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of reviews")
+        await run_in_threadpool(ingester.feed, enumerate(records, 1))
+    else:
+        row, buffered, tail = 0, [], b""
+        async for chunk in request.stream():
+            *lines, tail = (tail + chunk).split(b"\n")
+            for line in lines:
+                row += 1
+                buffered.append((row, line))
+            if len(buffered) >= ingester.chunk_size:
+                await run_in_threadpool(ingester.feed, buffered)
+                buffered = []
+        if tail:
+            buffered.append((row + 1, tail))
+        await run_in_threadpool(ingester.feed, buffered)
+
+    await run_in_threadpool(ingester.flush)
+    return ingester.report()
+
+
+async def _limited_body(request: Request, max_bytes: int) -> bytes:
+    too_large = HTTPException(
+        status_code=413, detail=f"JSON body over {max_bytes} bytes; send large imports as NDJSON (application/x-ndjson)"
+    )
+    if int(request.headers.get("content-length") or 0) > max_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+@router.get("/queue")
+def scoring_queue_depth(db: Session = Depends(get_db)):
+    return {"depth": scoring_queue.queue_depth(db), "max": scoring_queue.QUEUE_MAX}
+
+
+@router.get("/{review_id}/status", response_model=models.ReviewStatus)
+def review_status(review_id: int, db: Session = Depends(get_db)):
+    review = db.query(Review).filter(Review.id == review_id).first()
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+    job = db.query(ScoringJob).filter(ScoringJob.review_id == review_id).first()
+    status = review.sentiment_status or "done"
+    return models.ReviewStatus(
+        id=review.id,
+        sentiment_status=status,
+        sentiment_score=review.sentiment_score if status == "done" else None,
+        sentiment_label=review.sentiment_label,
+        attempts=job.attempts if job else 0,
+        last_error=job.last_error if job else None,
+    )
+
+
+@router.delete("/{review_id}", response_model=dict)
+def delete_review(review_id: int, db: Session = Depends(get_db)):
+    review = db.query(Review).filter(Review.id == review_id).first()
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+    if review.sentiment_status in (None, "done"):
+        hooks.reviews_unscored(
+            db,
+            [hooks.ScoredReview(review.id, review.movie_id, review.sentiment_score, review.sentiment_label, review.created_at)],
+        )
+    hooks.reviews_removed(db, [(review.id, review.movie_id)])
+    db.query(ScoringJob).filter(ScoringJob.review_id == review_id).delete(synchronize_session=False)
+    db.delete(review)
     db.commit()
-    db.refresh(review)
-    # refresh 후에도 sentiment_label이 유지되도록 다시 설정
-    review.sentiment_label = label
-    return review
+    return {"ok": True}
 
 
 @router.get("/", response_model=list[models.Review])
-def list_reviews(db: Session = Depends(get_db)):
-    reviews = db.query(Review).order_by(Review.created_at.desc()).limit(10).all()
-    for r in reviews:
-        if not getattr(r, "sentiment_label", None):
-            try:
-                _, label = sentiment.analyze(r.content)
-                r.sentiment_label = label
-            except Exception:
-                r.sentiment_label = None
-    return reviews
+def list_reviews(
+    request: Request,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """Newest reviews first, paginated with X-Next-Cursor (first page defaults to 10)."""
+    size = pagination.page_size(page_size, default=10)
+
+    def build(headers):
+        rows = db.execute(_newest_first(select(*serialization.REVIEW_COLUMNS), cursor).limit(size + 1)).all()
+        return serialization.as_dicts(pagination.trim_page(headers, rows, size, _review_key))
+
+    return http_cache.conditional(request, db, [versions.REVIEWS], build)
 
 
 @router.get("/movie/{movie_id}", response_model=list[models.Review])
-def list_reviews_by_movie(movie_id: int, limit: int | None = None, db: Session = Depends(get_db)):
-    query = (
-        db.query(Review)
-        .filter(Review.movie_id == movie_id)
-        .order_by(Review.created_at.desc())
-    )
-    if limit is not None:
-        query = query.limit(limit)
-    reviews = query.all()
-    for r in reviews:
-        if not getattr(r, "sentiment_label", None):
-            try:
-                _, label = sentiment.analyze(r.content)
-                r.sentiment_label = label
-            except Exception:
-                r.sentiment_label = None
-    return reviews
+def list_reviews_by_movie(
+    movie_id: int,
+    request: Request,
+    limit: int | None = None,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """A movie's reviews, newest first; `limit` is kept as an alias of `page_size`."""
+    size = pagination.page_size(page_size if page_size is not None else limit)
+
+    def build(headers):
+        query = select(*serialization.REVIEW_COLUMNS).where(Review.movie_id == movie_id)
+        rows = db.execute(_newest_first(query, cursor).limit(size + 1)).all()
+        return serialization.as_dicts(pagination.trim_page(headers, rows, size, _review_key))
+
+    return http_cache.conditional(request, db, [versions.movie_key(movie_id)], build)
+
+
+def _newest_first(query, cursor: str | None):
+    # matches the (created_at DESC, id) indexes
+    query = query.order_by(Review.created_at.desc(), Review.id)
+    if cursor:
+        created_at, last_id = pagination.decode_cursor(cursor, (datetime, int))
+        query = query.where(
+            (Review.created_at < created_at) | ((Review.created_at == created_at) & (Review.id > last_id))
+        )
+    return query
+
+
+def _review_key(review) -> list:
+    return [review.created_at, review.id]
 
 
 @router.get("/movie/{movie_id}/rating")
-def average_rating(movie_id: int, db: Session = Depends(get_db)):
-    reviews = db.query(Review).filter(Review.movie_id == movie_id).all()
-    if not reviews:
-        raise HTTPException(status_code=404, detail="No reviews")
-    avg_score = sum(r.sentiment_score for r in reviews) / len(reviews)
-    return {"movie_id": movie_id, "average_sentiment": avg_score}
+def average_rating(movie_id: int, request: Request, db: Session = Depends(get_db)):
+    def build(headers):
+        stats = aggregates.get(db, movie_id)
+        if not stats or not stats.review_count:
+            raise HTTPException(status_code=404, detail="No reviews")
+        return {
+            "movie_id": movie_id,
+            "average_sentiment": stats.score_sum / stats.review_count,
+            "review_count": stats.review_count,
+            "label_counts": {
+                "positive": stats.positive_count,
+                "neutral": stats.neutral_count,
+                "negative": stats.negative_count,
+            },
+        }
+
+    return http_cache.conditional(request, db, [versions.movie_key(movie_id)], build)
+
+
+@router.get("/movie/{movie_id}/trend", response_model=models.MovieTrend)
+def movie_trend(
+    movie_id: int,
+    request: Request,
+    bucket: Literal["day", "week", "month"] = "day",
+    since: date | None = None,
+    until: date | None = None,
+    db: Session = Depends(get_db),
+):
+    """Review count, mean score and label counts per day/week/month (UTC), from the daily rollup."""
+
+    def build(headers):
+        points = trends.get(db, movie_id, bucket, since, until)
+        return {"movie_id": movie_id, "bucket": bucket, "points": points}
+
+    return http_cache.conditional(request, db, [versions.movie_key(movie_id)], build)
@@ -0,0 +1,107 @@
+"""/reviews routes on AsyncSession, mounted instead of backend.api.reviews when DATABASE_URL uses an async driver.
+
+Like backend.api.movies_async, the database work reuses the sync handlers via
+run_sync. Model warmup waits, inference and group-commit hand-offs block, so
+they run in the threadpool and never on the event loop.
+"""
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import group_commit, models, scoring_queue, sentiment
+from backend.api import reviews
+from backend.api.movies_async import run_sync
+from backend.db import Movie, Review, get_async_db
+
+router = APIRouter()
+
+
+@router.post("/", response_model=models.Review)
+async def create_review(payload: models.ReviewCreate, response: Response, db: AsyncSession = Depends(get_async_db)):
+    if await db.get(Movie, payload.movie_id) is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+
+    if scoring_queue.ASYNC_WRITES:
+        try:
+            review = await db.run_sync(scoring_queue.enqueue_review, payload)
+        except scoring_queue.QueueFull:
+            raise HTTPException(
+                status_code=429, detail="Too many reviews waiting for scoring", headers={"Retry-After": "10"}
+            )
+        response.status_code = 202
+        return review
+
+    await run_in_threadpool(reviews._require_model)
+    score, label = await run_in_threadpool(sentiment.analyze, payload.content)
+    if group_commit.ENABLED:
+        review_id = await run_in_threadpool(
+            group_commit.get_committer().submit, lambda s: reviews._insert_review(s, payload, score, label)
+        )
+    else:
+        review_id = await db.run_sync(reviews._insert_review, payload, score, label)
+        await db.commit()
+    return await db.get(Review, review_id)
+
+
+# streams the body and already hands each chunk to the threadpool
+router.add_api_route("/bulk", reviews.create_reviews_bulk, methods=["POST"])
+
+
+@router.get("/queue")
+async def scoring_queue_depth(db: AsyncSession = Depends(get_async_db)):
+    return await run_sync(db, reviews.scoring_queue_depth)
+
+
+@router.get("/{review_id}/status", response_model=models.ReviewStatus)
+async def review_status(review_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await run_sync(db, reviews.review_status, review_id)
+
+
+@router.delete("/{review_id}", response_model=dict)
+async def delete_review(review_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await run_sync(db, reviews.delete_review, review_id)
+
+
+@router.get("/", response_model=list[models.Review])
+async def list_reviews(
+    request: Request,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Newest reviews first, paginated with X-Next-Cursor (first page defaults to 10)."""
+    return await run_sync(db, reviews.list_reviews, request, cursor, page_size)
+
+
+@router.get("/movie/{movie_id}", response_model=list[models.Review])
+async def list_reviews_by_movie(
+    movie_id: int,
+    request: Request,
+    limit: int | None = None,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """A movie's reviews, newest first; `limit` is kept as an alias of `page_size`."""
+    return await run_sync(db, reviews.list_reviews_by_movie, movie_id, request, limit, cursor, page_size)
+
+
+@router.get("/movie/{movie_id}/rating")
+async def average_rating(movie_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await run_sync(db, reviews.average_rating, movie_id, request)
+
+
+@router.get("/movie/{movie_id}/trend", response_model=models.MovieTrend)
+async def movie_trend(
+    movie_id: int,
+    request: Request,
+    bucket: Literal["day", "week", "month"] = "day",
+    since: date | None = None,
+    until: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Review count, mean score and label counts per day/week/month (UTC), from the daily rollup."""
+    return await run_sync(db, reviews.movie_trend, movie_id, request, bucket, since, until)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from backend import models, search
+from backend.db import Movie, Review, get_db
+
+router = APIRouter()
+
+
+@router.get("/", response_model=models.SearchResults)
+def search_all(
+    q: str = Query(..., min_length=1),
+    kind: str = Query("all", pattern="^(all|movies|reviews)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Ranked movies (title/director/genre) and reviews (content) matching every part of q."""
+    results = models.SearchResults(query=q)
+    if kind in ("all", "movies"):
+        hits = search.search(db, q, "movies", limit, offset)
+        results.movies = _load(db, Movie, models.Movie, hits)
+    if kind in ("all", "reviews"):
+        hits = search.search(db, q, "reviews", limit, offset)
+        results.reviews = _load(db, Review, models.Review, hits)
+    return results
+
+
+def _load(db: Session, table, schema, hits):
+    rows = {row.id: row for row in db.query(table).filter(table.id.in_([doc_id for doc_id, _ in hits]))}
+    return [
+        models.SearchHit(score=score, item=schema.model_validate(rows[doc_id], from_attributes=True))
+        for doc_id, score in hits
+        if doc_id in rows
+    ]
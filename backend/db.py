@@ -1,17 +1,119 @@
 import os
+import time
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, Text, create_engine
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Text,
+    create_engine,
+    event,
+    inspect,
+    make_url,
+    text,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, relationship, sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from backend import metrics
 
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./backend/app.db")
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+# An async driver (sqlite+aiosqlite, postgresql+asyncpg) switches the API routes to AsyncSession.
+# Startup, scripts and background workers keep a sync engine on the same database.
+_url = make_url(DATABASE_URL)
+IS_ASYNC = _url.get_dialect().is_async
+SYNC_DATABASE_URL = (
+    _url.set(drivername=_url.get_backend_name()).render_as_string(hide_password=False) if IS_ASYNC else DATABASE_URL
+)
+
+# Production SQLite profile, applied to every new connection (SQLITE_TUNING=0 turns it off)
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "1") == "1"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+_memory_db = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") in ("sqlite:", "sqlite+pysqlite:"))
+_engine_options = dict(
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    # an in-memory database exists per connection, so it cannot be pooled
+    **({} if _memory_db else {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_pre_ping": True}),
 )
+engine = create_engine(SYNC_DATABASE_URL, **_engine_options)
+async_engine = create_async_engine(DATABASE_URL, **_engine_options) if IS_ASYNC else None
+
+
+@event.listens_for(engine, "connect")
+def _apply_sqlite_pragmas(dbapi_conn, _record) -> None:
+    if not IS_SQLITE:
+        return
+    cursor = dbapi_conn.cursor()
+    # SQLite ignores REFERENCES unless enabled per connection; movie deletes rely on ON DELETE CASCADE
+    cursor.execute("PRAGMA foreign_keys=ON")
+    if not SQLITE_TUNING:
+        cursor.close()
+        return
+    # WAL: readers don't block the writer and commits are sequential appends
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # NORMAL is durable across app crashes in WAL mode; only an OS crash can lose the last commits
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+_TIMED_STATEMENTS = {"select", "insert", "update", "delete"}
+
+
+def _query_started(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+    context.query_started = time.perf_counter()
+
+
+def _query_finished(_conn, _cursor, statement, _parameters, context, _executemany) -> None:
+    kind = statement.lstrip()[:6].lower()
+    metrics.DB_QUERY_SECONDS.observe(
+        time.perf_counter() - context.query_started, kind if kind in _TIMED_STATEMENTS else "other"
+    )
+
+
+for _engine in filter(None, (engine, async_engine and async_engine.sync_engine)):
+    event.listen(_engine, "before_cursor_execute", _query_started)
+    event.listen(_engine, "after_cursor_execute", _query_finished)
+
+if async_engine is not None:
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+
+# every Session (AsyncSession commits through one too); a failed commit never reaches after_commit
+@event.listens_for(Session, "before_commit")
+def _commit_started(session) -> None:
+    session.info["commit_started"] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_finished(session) -> None:
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        metrics.DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# handlers return ORM objects after commit, and lazy refreshes are not possible outside the event loop
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False) if async_engine is not None else None
+)
 Base = declarative_base()
 
 
@@ -26,22 +128,160 @@ class Movie(Base):
     poster_url = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    reviews = relationship("Review", back_populates="movie", cascade="all, delete-orphan")
+    # the database deletes reviews (and their scoring jobs) itself; nothing is loaded into the session
+    reviews = relationship("Review", back_populates="movie", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Review(Base):
     __tablename__ = "reviews"
 
     id = Column(Integer, primary_key=True, index=True)
-    movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False, index=True)
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False)
     author = Column(String, nullable=False)
     content = Column(Text, nullable=False)
     sentiment_score = Column(Float, nullable=False)
     sentiment_label = Column(String, nullable=True)
+    # model tag that produced the score; rows from an older model are rescored by the backfill job
+    sentiment_model = Column(String, nullable=True)
+    # "pending" while queued for write-behind scoring, "failed" after the last retry; NULL/"done" once scored
+    sentiment_status = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     movie = relationship("Movie", back_populates="reviews")
 
+    # keyset pagination orders by (created_at DESC, id), globally and per movie
+    __table_args__ = (
+        Index("ix_reviews_movie_created_id", movie_id, created_at.desc(), id),
+        Index("ix_reviews_created_id", created_at.desc(), id),
+    )
+
+
+class ScoringJob(Base):
+    __tablename__ = "scoring_jobs"
+
+    id = Column(Integer, primary_key=True)
+    review_id = Column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), nullable=False, index=True)
+    # queued -> running -> (deleted on success) | queued again for retry | failed
+    status = Column(String, nullable=False, default="queued", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class MovieStats(Base):
+    """Running per-movie totals over scored reviews, maintained by backend.aggregates."""
+
+    __tablename__ = "movie_stats"
+
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    neutral_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+
+
+class MovieDailyStats(Base):
+    """Per-movie, per-day review totals (UTC days of created_at), maintained by backend.trends."""
+
+    __tablename__ = "movie_daily_stats"
+
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    neutral_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+
+
+class DataVersion(Base):
+    """Change counter per cache key ("movies", "reviews", "movie:<id>"), bumped by every write."""
+
+    __tablename__ = "data_versions"
+
+    key = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+def init_db() -> None:
+    """Create tables and add columns/indexes introduced after a database file was first created."""
+    Base.metadata.create_all(bind=engine)
+    _upgrade_schema()
+    if IS_SQLITE:
+        # search's FTS5 tables, created before any writer needs them
+        from backend import search
+
+        search.create_tables()
+
+
+def _upgrade_schema() -> None:
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+    if IS_SQLITE:
+        for table in Base.metadata.sorted_tables:
+            if inspector.has_table(table.name) and _missing_cascade(inspector, table):
+                _rebuild_sqlite_table(table)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def _missing_cascade(inspector, table) -> bool:
+    existing = {
+        (tuple(fk["constrained_columns"]), (fk.get("options") or {}).get("ondelete", "").upper())
+        for fk in inspector.get_foreign_keys(table.name)
+    }
+    return any(
+        (tuple(c.name for c in fk.columns), fk.ondelete.upper()) not in existing
+        for fk in table.foreign_key_constraints
+        if fk.ondelete
+    )
+
+
+def _rebuild_sqlite_table(table) -> None:
+    """Recreate a table with its current definition (SQLite cannot ALTER a foreign key).
+
+    Follows SQLite's documented copy-drop-rename procedure with foreign keys off;
+    indexes are recreated by the caller.
+    """
+    scratch = MetaData()
+    for other in Base.metadata.sorted_tables:
+        if other is not table:
+            other.to_metadata(scratch)
+    new_name = f"_{table.name}_rebuild"
+    create = CreateTable(table.to_metadata(scratch, name=new_name)).compile(dialect=engine.dialect)
+    columns = ", ".join(c.name for c in table.columns)
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.executescript(
+            f"""
+            PRAGMA foreign_keys=OFF;
+            BEGIN;
+            {create};
+            INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {table.name};
+            DROP TABLE {table.name};
+            ALTER TABLE {new_name} RENAME TO {table.name};
+            COMMIT;
+            PRAGMA foreign_keys=ON;
+            """
+        )
+    finally:
+        raw.close()
+
 
 def get_db():
     db = SessionLocal()
@@ -49,3 +289,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
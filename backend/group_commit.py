@@ -0,0 +1,107 @@
+"""Group commit: merge small concurrent writes into one transaction.
+
+SQLite allows one writer at a time and every commit pays for a WAL sync, so
+under concurrent POST load most time goes to waiting for the lock. With
+SQLITE_GROUP_COMMIT=1, request threads hand their write to a single committer
+thread that runs everything queued within GROUP_COMMIT_WAIT_MS in one session
+and commits once.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+
+from backend import metrics
+from backend.db import SessionLocal
+
+ENABLED = os.getenv("SQLITE_GROUP_COMMIT", "0") == "1"
+MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+MAX_WAIT_MS = float(os.getenv("GROUP_COMMIT_WAIT_MS", "2"))
+
+T = TypeVar("T")
+Job = Tuple[Callable[[Session], object], Future]
+
+
+class GroupCommitter:
+    """Run write callables from many threads in shared transactions.
+
+    Each callable gets the shared session, must not commit, and should return plain
+    values (ids) rather than ORM objects. If any callable in a group fails, the group
+    is rolled back and each callable is retried in its own transaction, so one bad
+    write only fails its own caller.
+    """
+
+    def __init__(self, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS) -> None:
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Job]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[[Session], T]) -> T:
+        future: Future = Future()
+        self._queue.put((fn, future))
+        return future.result()
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _collect(self) -> List[Job]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if not self._commit_group(batch):
+                for job in batch:
+                    self._commit_group([job])
+
+    def _commit_group(self, batch: List[Job]) -> bool:
+        db = SessionLocal()
+        try:
+            results = [fn(db) for fn, _ in batch]
+            db.commit()
+        except Exception as exc:  # noqa: BLE001
+            db.rollback()
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return True
+            return False
+        finally:
+            db.close()
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+        return True
+
+
+_committer: Optional[GroupCommitter] = None
+_committer_lock = threading.Lock()
+
+
+def get_committer() -> GroupCommitter:
+    """The process-wide committer; concurrent first callers must not each start one."""
+    global _committer
+    if _committer is None:
+        with _committer_lock:
+            if _committer is None:
+                _committer = GroupCommitter()
+    return _committer
+
+
+metrics.Callback(
+    "group_commit_queue_depth",
+    "Writes waiting for the group committer.",
+    lambda: _committer.depth() if _committer is not None else 0,
+)
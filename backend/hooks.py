@@ -0,0 +1,71 @@
+"""Keep derived data in step with movie and review writes.
+
+Every code path that creates, scores, rescores or deletes movies and reviews
+calls these functions inside its own transaction, so the derived tables
+(aggregates, trend rollups, search index, cache versions) commit or roll back together with the
+rows themselves.
+"""
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend import aggregates, search, trends, versions
+from backend.db import Movie
+
+
+class ScoredReview(NamedTuple):
+    id: int
+    movie_id: int
+    score: float
+    label: Optional[str]
+    created_at: Optional[datetime]
+
+
+def movie_added(db: Session, movie: Movie) -> None:
+    search.index_movies(db, [movie])
+    versions.bump(db, [versions.MOVIES])
+
+
+def reviews_added(db: Session, reviews: Iterable[Tuple[int, int, str]]) -> None:
+    """New review rows as (id, movie id, content), scored or not."""
+    reviews = list(reviews)
+    search.index_reviews(db, reviews)
+    _bump_reviews(db, (movie_id for _, movie_id, _ in reviews))
+
+
+def reviews_removed(db: Session, reviews: Iterable[Tuple[int, int]]) -> None:
+    """Review rows as (id, movie id) about to be deleted (call reviews_unscored first for scored ones)."""
+    reviews = list(reviews)
+    search.remove_reviews(db, [review_id for review_id, _ in reviews])
+    _bump_reviews(db, (movie_id for _, movie_id in reviews))
+
+
+def reviews_scored(db: Session, reviews: Iterable[ScoredReview]) -> None:
+    """Reviews whose score now counts (new, or rescored after reviews_unscored)."""
+    reviews = list(reviews)
+    aggregates.apply(db, reviews, sign=1)
+    trends.apply(db, reviews, sign=1)
+    _bump_reviews(db, (r.movie_id for r in reviews))
+
+
+def reviews_unscored(db: Session, reviews: Iterable[ScoredReview]) -> None:
+    """Reviews whose previous score no longer counts (deleted, or about to be rescored)."""
+    reviews = list(reviews)
+    aggregates.apply(db, reviews, sign=-1)
+    trends.apply(db, reviews, sign=-1)
+    _bump_reviews(db, (r.movie_id for r in reviews))
+
+
+def movies_deleted(db: Session, movie_ids: List[int]) -> None:
+    """Movies (and with them all their reviews) about to be deleted."""
+    aggregates.drop(db, movie_ids)
+    trends.drop(db, movie_ids)
+    search.remove_movies(db, movie_ids)
+    versions.bump(db, [versions.MOVIES, versions.REVIEWS, *map(versions.movie_key, movie_ids)])
+
+
+def _bump_reviews(db: Session, movie_ids: Iterable[int]) -> None:
+    keys = {versions.movie_key(movie_id) for movie_id in movie_ids}
+    if keys:
+        versions.bump(db, [versions.REVIEWS, *keys])
@@ -0,0 +1,79 @@
+"""Conditional GET (ETag / Last-Modified) and a versioned response cache for read endpoints.
+
+The ETag of a response is derived from its URL and the versions of the data
+it depends on (backend.versions). A matching If-None-Match, or an
+If-Modified-Since no older than the last change, gets an empty 304. Otherwise
+the serialized body is served from an in-process LRU keyed the same way, so
+an unchanged list is built from the database and encoded only once per worker.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, List, MutableMapping, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from backend import metrics, serialization, versions
+
+CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+
+_cache: "OrderedDict[str, Tuple[bytes, Dict[str, str]]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def conditional(
+    request: Request,
+    db: Session,
+    keys: List[str],
+    build: Callable[[MutableMapping[str, str]], Any],
+) -> Response:
+    """Serve a JSON GET response that depends on the given version keys.
+
+    build(headers) returns the JSON-ready payload and may add response headers
+    (e.g. X-Next-Cursor); it only runs on a cache miss.
+    """
+    numbers, changed_at = versions.current(db, keys)
+    digest = hashlib.sha1(f"{request.url.path}?{request.url.query}|{numbers}".encode()).hexdigest()[:20]
+    etag = f'W/"{digest}"'
+    validators = {"ETag": etag, "Cache-Control": "no-cache"}
+    if changed_at is not None:
+        validators["Last-Modified"] = format_datetime(changed_at.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+    if _not_modified(request, etag, changed_at):
+        metrics.HTTP_CACHE_RESPONSES.inc("not_modified")
+        return Response(status_code=304, headers=validators)
+
+    with _lock:
+        hit = _cache.get(digest)
+        if hit is not None:
+            _cache.move_to_end(digest)
+    metrics.HTTP_CACHE_RESPONSES.inc("miss" if hit is None else "hit")
+    if hit is None:
+        extra: Dict[str, str] = {}
+        body = serialization.dumps(build(extra))
+        hit = (body, extra)
+        with _lock:
+            _cache[digest] = hit
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    body, extra = hit
+    return Response(content=body, media_type="application/json", headers={**extra, **validators})
+
+
+def _not_modified(request: Request, etag: str, changed_at: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and changed_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return changed_at.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
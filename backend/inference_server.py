@@ -0,0 +1,116 @@
+"""Shared inference process for multi-worker deployments.
+
+Run one of these per host and start the API workers with the same
+SENTIMENT_SERVER_ADDRESS and SENTIMENT_SERVER_AUTHKEY; the model and tokenizer
+are then loaded once here instead of once per uvicorn worker:
+
+    export SENTIMENT_SERVER_AUTHKEY=$(openssl rand -hex 32)
+    SENTIMENT_SERVER_ADDRESS=/tmp/sentiment/sentiment.sock python -m backend.inference_server &
+    SENTIMENT_SERVER_ADDRESS=/tmp/sentiment/sentiment.sock uvicorn backend.main:app --workers 4
+
+A unix socket is created mode 0600 in a directory that only this user can
+access (created 0700 if missing). Requests are JSON, so a client that passes
+the authkey handshake still cannot make this process unpickle anything.
+
+Single-review requests from all workers go through the micro-batching scheduler,
+so concurrent POSTs across processes still share one ONNX batch.
+"""
+import argparse
+import os
+import stat
+import threading
+from multiprocessing.connection import Listener
+
+from backend import sentiment
+
+
+def _handle(conn) -> None:
+    with conn:
+        while True:
+            try:
+                message = sentiment.recv_message(conn)
+            except (EOFError, OSError, ValueError):
+                # closed, oversized or not JSON: drop the connection
+                return
+            try:
+                op, payload = message
+                if op == "analyze":
+                    result = sentiment._score_one(_text(payload))
+                elif op == "analyze_batch":
+                    result = sentiment._score_batch(_texts(payload))
+                elif op == "analyze_long":
+                    result = sentiment._score_long(_texts(payload))
+                elif op == "ping":
+                    result = "pong"
+                else:
+                    raise ValueError(f"unknown op {op!r}")
+                sentiment.send_message(conn, [True, result])
+            except Exception as exc:  # noqa: BLE001
+                sentiment.send_message(conn, [False, str(exc)])
+
+
+def _text(payload) -> str:
+    if not isinstance(payload, str):
+        raise ValueError("expected a string")
+    return payload
+
+
+def _texts(payload) -> list:
+    if not isinstance(payload, list) or not all(isinstance(t, str) for t in payload):
+        raise ValueError("expected a list of strings")
+    return payload
+
+
+def _prepare_socket_dir(path: str) -> None:
+    """Create the socket's directory 0700, or refuse one that other users can reach."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.stat(directory)
+    if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+        raise SystemExit(
+            f"{directory} must be owned by this user and closed to others (chmod 700); "
+            "put the socket in a private directory, e.g. /tmp/sentiment/sentiment.sock"
+        )
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def serve(address: str) -> None:
+    # this process does the scoring itself
+    sentiment.SERVER_ADDRESS = ""
+    sentiment.warmup()
+
+    try:
+        sentiment.check_server_settings(address)
+    except RuntimeError as exc:
+        raise SystemExit(str(exc))
+    parsed = sentiment.parse_address(address)
+    if isinstance(parsed, str):
+        _prepare_socket_dir(parsed)
+        # the socket file is created with the process umask; start it out 0600
+        previous = os.umask(0o177)
+        try:
+            listener = Listener(parsed, authkey=sentiment.SERVER_AUTHKEY)
+        finally:
+            os.umask(previous)
+    else:
+        listener = Listener(parsed, authkey=sentiment.SERVER_AUTHKEY)
+    with listener:
+        print(f"Sentiment inference server listening on {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception:  # noqa: BLE001  (failed handshake from a stray client)
+                continue
+            threading.Thread(target=_handle, args=(conn,), daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared sentiment inference server")
+    parser.add_argument("--address", default=os.getenv("SENTIMENT_SERVER_ADDRESS") or "/tmp/sentiment/sentiment.sock")
+    args = parser.parse_args()
+    serve(args.address)
+
+
+if __name__ == "__main__":
+    main()
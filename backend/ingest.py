@@ -0,0 +1,112 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from backend import hooks, models, sentiment
+from backend.db import Movie, Review
+
+# rows per transaction (and per movie lookup / sentiment batch)
+CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "500"))
+# per-row errors kept in the report; later ones are only counted
+MAX_ERRORS = 1000
+
+
+class ReviewIngester:
+    """Validate, score and insert reviews in fixed-size chunks.
+
+    Feed it (row number, record) pairs where a record is a dict or an NDJSON line.
+    Only one chunk is held in memory at a time, and a bad row is reported
+    without affecting the rest of its chunk.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = CHUNK_SIZE) -> None:
+        self.db = db
+        self.chunk_size = max(1, chunk_size)
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._pending: List[Tuple[int, models.ReviewCreate]] = []
+
+    def feed(self, records: Iterable[Tuple[int, Any]]) -> None:
+        for row, record in records:
+            try:
+                if isinstance(record, (str, bytes)):
+                    if not record.strip():
+                        continue
+                    record = json.loads(record)
+                self._pending.append((row, models.ReviewCreate.model_validate(record)))
+            except (ValueError, ValidationError) as exc:
+                self._error(row, _describe(exc))
+            if len(self._pending) >= self.chunk_size:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        movie_ids = {item.movie_id for _, item in pending}
+        known = set(self.db.scalars(select(Movie.id).where(Movie.id.in_(movie_ids))))
+        valid = []
+        for row, item in pending:
+            if item.movie_id in known:
+                valid.append((row, item))
+            else:
+                self._error(row, "Movie not found")
+        if not valid:
+            return
+
+        try:
+            self._insert(valid)
+        except Exception as exc:  # noqa: BLE001
+            self.db.rollback()
+            for row, _ in valid:
+                self._error(row, f"insert failed: {exc}")
+
+    def _insert(self, valid: List[Tuple[int, models.ReviewCreate]]) -> None:
+        results = sentiment.analyze_batch([item.content for _, item in valid])
+        tag = sentiment.model_tag()
+        now = datetime.utcnow()
+        rows = [
+            {
+                "movie_id": item.movie_id,
+                "author": item.author,
+                "content": item.content,
+                "sentiment_score": score,
+                "sentiment_label": label,
+                "sentiment_model": tag,
+                "sentiment_status": "done",
+                "created_at": now,
+            }
+            for (_, item), (score, label) in zip(valid, results)
+        ]
+        ids = self.db.scalars(insert(Review).returning(Review.id, sort_by_parameter_order=True), rows).all()
+        hooks.reviews_added(self.db, [(review_id, r["movie_id"], r["content"]) for review_id, r in zip(ids, rows)])
+        hooks.reviews_scored(
+            self.db,
+            [
+                hooks.ScoredReview(review_id, r["movie_id"], r["sentiment_score"], r["sentiment_label"], now)
+                for review_id, r in zip(ids, rows)
+            ],
+        )
+        self.db.commit()
+        self.inserted += len(rows)
+
+    def report(self) -> Dict[str, Any]:
+        return {"inserted": self.inserted, "failed": self.failed, "errors": self.errors}
+
+    def _error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+    return str(exc)
@@ -1,9 +1,26 @@
-from fastapi import FastAPI
+import logging
+import os
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+
+from backend import aggregates, metrics, scoring_queue, search, sentiment, trends
+from backend.api import search as search_api
+from backend.db import IS_ASYNC, SessionLocal, async_engine, init_db
+
+if IS_ASYNC:
+    from backend.api import movies_async as movies
+    from backend.api import reviews_async as reviews
+else:
+    from backend.api import movies, reviews
+
+# measured from module import, i.e. roughly when the server process started loading the app
+_STARTED_AT = time.monotonic()
+_startup = {"time_to_first_request_s": None}
 
-from backend import sentiment
-from backend.api import movies, reviews
-from backend.db import Base, engine
+logger = logging.getLogger("uvicorn.error")
 
 app = FastAPI()
 
@@ -14,19 +31,78 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # label by route template (/movies/{movie_id}), not the raw path, to keep the series count bounded
+    route = request.scope.get("route")
+    metrics.HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - started,
+        request.method,
+        getattr(route, "path", "unmatched"),
+        str(response.status_code),
+    )
+    if _startup["time_to_first_request_s"] is None:
+        _startup["time_to_first_request_s"] = time.monotonic() - _STARTED_AT
+        logger.info("time to first request: %.2fs", _startup["time_to_first_request_s"])
+    return response
+
+
 @app.on_event("startup")
 def startup_tasks():
-    Base.metadata.create_all(bind=engine)
-    sentiment.warmup()
+    if sentiment.SERVER_ADDRESS:
+        sentiment.check_server_settings()
+    init_db()
+    with SessionLocal() as db:
+        aggregates.ensure_initialized(db)
+        trends.ensure_initialized(db)
+        search.ensure_initialized(db)
+    # model load/export runs in the background so the port opens immediately
+    sentiment.start_background_warmup()
+    if scoring_queue.ASYNC_WRITES and os.getenv("SCORING_WORKER", "1") == "1":
+        # set SCORING_WORKER=0 when running `python -m backend.scoring_queue` separately
+        scoring_queue.ScoringWorker().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_tasks():
+    if async_engine is not None:
+        # aiosqlite runs each connection on a non-daemon thread that would keep the process alive
+        await async_engine.dispose()
 
 
 @app.get("/health")
 def health_check():
+    """Liveness: the process is up and serving HTTP."""
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def readiness_check():
+    """Readiness: the sentiment model is loaded and review writes can be scored."""
+    body = {
+        **sentiment.readiness(),
+        "uptime_s": time.monotonic() - _STARTED_AT,
+        **_startup,
+    }
+    return JSONResponse(body, status_code=200 if sentiment.is_ready() else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/sentiment/cache")
+def sentiment_cache_stats():
+    return sentiment.cache_stats()
+
+
 app.include_router(movies.router, prefix="/movies", tags=["movies"])
 app.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
+app.include_router(search_api.router, prefix="/search", tags=["search"])
@@ -0,0 +1,178 @@
+"""Process metrics in the Prometheus text format, served on GET /metrics.
+
+Recording an observation takes a lock, a bisect and two additions, so the
+hot-path instrumentation (tokenize / session.run / post-processing, every
+database statement and commit, every request) stays on permanently. Numbers
+that are already kept elsewhere (result cache hits, queue lengths) are only
+read when /metrics is scraped.
+
+Every uvicorn worker has its own registry; with --workers N a scrape reaches
+one of them, so run one worker per scrape target when exact totals matter.
+With SENTIMENT_SERVER_ADDRESS the model stages run in the inference server
+and do not show up in the API process.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds: 0.5ms .. 10s
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+LabelValues = Tuple[str, ...]
+
+_registry: List["_Metric"] = []
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_labels(self.labels, key)} {_number(v)}" for key, v in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # per label values: [count per bucket (last one is +Inf)], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def time(self, *label_values: str) -> "_Timer":
+        """Context manager observing the elapsed seconds of its block."""
+        return _Timer(self, label_values)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = {key: (list(counts), total[0]) for key, (counts, total) in self._values.items()}
+        lines = []
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Callback(_Metric):
+    """Gauge or counter whose values are read from fn() at scrape time.
+
+    fn returns a number, or a dict of label values (tuples) to numbers.
+    """
+
+    def __init__(
+        self, name: str, documentation: str, fn: Callable[[], object], labels: Sequence[str] = (), kind: str = "gauge"
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.kind = kind
+        self.fn = fn
+
+    def samples(self) -> List[str]:
+        value = self.fn()
+        values = value if isinstance(value, dict) else {(): value}
+        return [f"{self.name}{_labels(self.labels, key)} {_number(v)}" for key, v in sorted(values.items())]
+
+
+class _Timer:
+    __slots__ = ("histogram", "label_values", "started")
+
+    def __init__(self, histogram: Histogram, label_values: LabelValues) -> None:
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, *self.label_values)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in _registry:
+        try:
+            samples = metric.samples()
+        except Exception:  # noqa: BLE001 - one failing callback must not break the scrape
+            continue
+        lines.extend(metric._header())
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Hot-path metrics shared across modules; callbacks are registered next to the data they read.
+SENTIMENT_STAGE_SECONDS = Histogram(
+    "sentiment_stage_seconds",
+    "Time per scoring stage: tokenize (incl. padding), inference (session.run), postprocess (softmax, labels).",
+    labels=("stage",),
+)
+SENTIMENT_BATCH_SIZE = Histogram("sentiment_batch_size", "Rows per session.run call.", buckets=SIZE_BUCKETS)
+DB_QUERY_SECONDS = Histogram("db_query_seconds", "Database statement execution time.", labels=("statement",))
+DB_COMMIT_SECONDS = Histogram("db_commit_seconds", "Session commit time, including the final flush.")
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by route template.", labels=("method", "route", "status")
+)
+HTTP_CACHE_RESPONSES = Counter(
+    "http_cache_responses_total",
+    "Conditional GET outcomes: not_modified (304), hit (cached body) or miss (built).",
+    labels=("result",),
+)
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Literal, Optional, Union
 
 class MovieCreate(BaseModel):
     title: str
@@ -25,6 +25,41 @@ class Review(ReviewCreate):
     sentiment_score: float
     created_at: datetime
     sentiment_label: Optional[str] = None
+    sentiment_status: Optional[str] = None
 
     class Config:
         orm_mode = True
+
+class ReviewStatus(BaseModel):
+    id: int
+    sentiment_status: str
+    sentiment_score: Optional[float] = None
+    sentiment_label: Optional[str] = None
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+class MovieSummary(Movie):
+    average_sentiment: Optional[float] = None
+    review_count: int = 0
+    label_counts: Dict[str, int] = {}
+    recent_reviews: List[Review] = []
+
+class SearchHit(BaseModel):
+    score: float
+    item: Union[Movie, Review]
+
+class SearchResults(BaseModel):
+    query: str
+    movies: List[SearchHit] = []
+    reviews: List[SearchHit] = []
+
+class TrendPoint(BaseModel):
+    start: date
+    review_count: int
+    average_sentiment: float
+    label_counts: Dict[str, int] = {}
+
+class MovieTrend(BaseModel):
+    movie_id: int
+    bucket: Literal["day", "week", "month"]
+    points: List[TrendPoint] = []
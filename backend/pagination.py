@@ -0,0 +1,63 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor encodes the sort key of the last row on the previous page, so the next
+page is an index range scan (WHERE key > cursor) instead of an OFFSET that grows
+with the page number. Clients get it from the X-Next-Cursor response header and
+must treat it as opaque.
+"""
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Any, List, MutableMapping, Optional, Sequence
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: List[Any]) -> str:
+    plain = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(plain).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """The cursor's sort-key values, checked against types (int or datetime); 400 if it doesn't fit."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong shape")
+        return [_typed(value, expected) for value, expected in zip(values, types)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _typed(value: Any, expected: type) -> Any:
+    if expected is datetime:
+        if not isinstance(value, str):
+            raise ValueError("expected an ISO timestamp")
+        return datetime.fromisoformat(value)
+    # bool is an int subclass, but never a valid key
+    if not isinstance(value, expected) or isinstance(value, bool):
+        raise ValueError(f"expected {expected.__name__}")
+    return value
+
+
+def page_size(requested: Optional[int], default: int = DEFAULT_PAGE_SIZE) -> int:
+    if requested is None:
+        return default
+    return max(1, min(requested, MAX_PAGE_SIZE))
+
+
+def trim_page(headers: MutableMapping[str, str], rows: List[Any], size: int, key) -> List[Any]:
+    """Cut rows (fetched with limit size + 1) to one page and set X-Next-Cursor if more follow.
+
+    key(row) returns the sort-key values stored in the cursor.
+    """
+    if len(rows) > size:
+        rows = rows[:size]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(key(rows[-1]))
+    return rows
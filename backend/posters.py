@@ -0,0 +1,220 @@
+"""Poster thumbnails: fetch a movie's poster_url once, serve small resized copies.
+
+Originals are stored under their URL hash, thumbnails under the same hash plus
+width and format, all in POSTER_CACHE_DIR, so a thumbnail hit reads one small
+file. When the
+directory grows past POSTER_CACHE_MAX_MB the least recently used files are
+deleted. Pillow is optional: without it thumbnail() returns None and the API
+redirects to the original URL.
+
+Poster URLs are user input, so only http(s) is fetched and hosts resolving to
+private/loopback addresses are refused unless POSTER_ALLOW_PRIVATE=1 (e.g. a
+local stand-in server in development). The connection goes to the address
+that was checked, and redirects are followed by hand with every hop checked
+the same way.
+"""
+import hashlib
+import http.client
+import io
+import ipaddress
+import os
+import socket
+import ssl
+import tempfile
+import threading
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+
+CACHE_DIR = os.getenv("POSTER_CACHE_DIR", os.path.join(os.path.dirname(__file__), "poster_cache"))
+CACHE_MAX_BYTES = int(float(os.getenv("POSTER_CACHE_MAX_MB", "200")) * 1024 * 1024)
+FETCH_TIMEOUT = float(os.getenv("POSTER_FETCH_TIMEOUT", "10"))
+MAX_ORIGINAL_BYTES = int(float(os.getenv("POSTER_MAX_ORIGINAL_MB", "20")) * 1024 * 1024)
+ALLOW_PRIVATE = os.getenv("POSTER_ALLOW_PRIVATE", "0") == "1"
+MAX_REDIRECTS = 5
+# requested widths snap up to one of these, so each poster has a handful of variants at most
+WIDTHS = (200, 400, 800)
+DEFAULT_WIDTH = 400
+QUALITY = 80
+FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+# thumbnail URLs carry a hash of poster_url (see frontend), so a response never changes
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# a fixed pool of locks, picked by path hash, serializes fetching/making the same file
+_locks = tuple(threading.Lock() for _ in range(64))
+
+
+class PosterUnavailable(Exception):
+    pass
+
+
+def snap_width(width: int) -> int:
+    return next((w for w in WIDTHS if w >= width), WIDTHS[-1])
+
+
+def thumbnail(url: str, width: int = DEFAULT_WIDTH, fmt: str = "webp") -> Optional[bytes]:
+    """The encoded thumbnail for url, from the cache or made now; None when Pillow is missing."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+
+    width = snap_width(width)
+    path = os.path.join(CACHE_DIR, "thumbs", f"{_url_hash(url)}-{width}.{fmt}")
+    # files are replaced atomically, so a hit needs no lock
+    cached = _read(path)
+    if cached is not None:
+        return cached
+    # never hold two pool locks at once: two paths may share a lock, and nesting could deadlock
+    data = _original(url)
+    with _lock_for(path):
+        cached = _read(path)
+        if cached is not None:
+            return cached
+        try:
+            image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+            # keep the aspect ratio and never upscale
+            image.thumbnail((width, width * 3))
+            if fmt == "jpeg" or image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGB")
+            out = io.BytesIO()
+            image.save(out, FORMATS[fmt][0], quality=QUALITY)
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            raise PosterUnavailable(f"poster is not a readable image ({type(exc).__name__})")
+        _write(path, out.getvalue())
+    _evict()
+    return out.getvalue()
+
+
+def _original(url: str) -> bytes:
+    path = os.path.join(CACHE_DIR, "originals", _url_hash(url))
+    with _lock_for(path):
+        data = _read(path)
+        if data is None:
+            data = _fetch(url)
+            _write(path, data)
+    return data
+
+
+def _url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+
+def _read(path: str) -> Optional[bytes]:
+    """Cached file contents, marking the file as recently used; None on a miss."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)
+        return data
+    except FileNotFoundError:
+        return None
+
+
+def _fetch(url: str) -> bytes:
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise PosterUnavailable("poster_url must be an http(s) URL")
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+        except ValueError:
+            raise PosterUnavailable("poster_url has an invalid port")
+        address = _checked_address(parts.hostname, port)
+        if parts.scheme == "https":
+            conn = _PinnedHTTPSConnection(parts.hostname, port, address)
+        else:
+            conn = _PinnedHTTPConnection(parts.hostname, port, address)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        try:
+            conn.request("GET", target, headers={"User-Agent": "movie-review-poster-proxy"})
+            response = conn.getresponse()
+            location = response.getheader("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            if response.status != 200:
+                raise PosterUnavailable(f"fetching {url} failed: HTTP {response.status}")
+            data = response.read(MAX_ORIGINAL_BYTES + 1)
+        except (OSError, http.client.HTTPException) as exc:
+            raise PosterUnavailable(f"fetching {url} failed: {exc}")
+        finally:
+            conn.close()
+        if len(data) > MAX_ORIGINAL_BYTES:
+            raise PosterUnavailable("poster is too large")
+        return data
+    raise PosterUnavailable(f"more than {MAX_REDIRECTS} redirects")
+
+
+def _checked_address(host: str, port: int) -> str:
+    """An address of host to connect to; every address it resolves to must be public."""
+    try:
+        addresses = [info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+    except OSError as exc:
+        raise PosterUnavailable(f"cannot resolve {host}: {exc}")
+    if not addresses:
+        raise PosterUnavailable(f"cannot resolve {host}")
+    if not ALLOW_PRIVATE:
+        for address in addresses:
+            ip = ipaddress.ip_address(address.split("%")[0])
+            if ip.version == 6 and ip.ipv4_mapped:
+                ip = ip.ipv4_mapped
+            if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved or ip.is_multicast:
+                raise PosterUnavailable(f"refusing to fetch from private address {ip}")
+    return addresses[0]
+
+
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    """Connects to an already checked address instead of resolving host again."""
+
+    def __init__(self, host: str, port: int, address: str) -> None:
+        super().__init__(host, port, timeout=FETCH_TIMEOUT)
+        self.address = address
+
+    def connect(self) -> None:
+        self.sock = socket.create_connection((self.address, self.port), self.timeout)
+
+
+class _PinnedHTTPSConnection(http.client.HTTPSConnection):
+    """Like _PinnedHTTPConnection; the certificate is still verified against host."""
+
+    def __init__(self, host: str, port: int, address: str) -> None:
+        super().__init__(host, port, timeout=FETCH_TIMEOUT, context=ssl.create_default_context())
+        self.address = address
+
+    def connect(self) -> None:
+        sock = socket.create_connection((self.address, self.port), self.timeout)
+        self.sock = self._context.wrap_socket(sock, server_hostname=self.host)
+
+
+def _lock_for(path: str) -> threading.Lock:
+    return _locks[hash(path) % len(_locks)]
+
+
+def _write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _evict() -> None:
+    """Delete least recently used files (by mtime, refreshed on every hit) until under the size cap."""
+    entries = []
+    for sub in ("originals", "thumbs"):
+        directory = os.path.join(CACHE_DIR, sub)
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file() and not entry.name.startswith(".tmp-"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
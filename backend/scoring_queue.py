@@ -0,0 +1,235 @@
+"""Write-behind sentiment scoring.
+
+With REVIEW_WRITE_MODE=async, POST /reviews/ stores the review as "pending" and
+adds a row to scoring_jobs; a ScoringWorker drains that table in batches and
+fills in the score. The worker runs inside the API process by default, or
+separately with:
+
+    REVIEW_WRITE_MODE=async python -m backend.scoring_queue
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import case, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend import hooks, metrics, models, sentiment, versions
+from backend.db import Review, ScoringJob, SessionLocal, init_db
+
+ASYNC_WRITES = os.getenv("REVIEW_WRITE_MODE", "sync").lower() == "async"
+# POST /reviews/ answers 429 once this many jobs are waiting
+QUEUE_MAX = int(os.getenv("SCORING_QUEUE_MAX", "10000"))
+BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "64"))
+MAX_ATTEMPTS = int(os.getenv("SCORING_MAX_ATTEMPTS", "5"))
+POLL_INTERVAL = float(os.getenv("SCORING_POLL_INTERVAL", "0.2"))
+# a "running" job older than this belonged to a worker that died; hand it out again
+CLAIM_TIMEOUT = timedelta(minutes=5)
+# scrapes within this many seconds reuse the last scoring_queue_depth count
+DEPTH_METRIC_TTL = float(os.getenv("SCORING_QUEUE_DEPTH_TTL", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    pass
+
+
+def queue_depth(db: Session) -> int:
+    return db.scalar(select(func.count(ScoringJob.id)).where(ScoringJob.status.in_(["queued", "running"])))
+
+
+# the worker may run in another process, so the depth is counted, not tracked here
+_depth_lock = threading.Lock()
+_depth_sample = (float("-inf"), 0)  # (time.monotonic() taken at, depth)
+
+
+def _metrics_queue_depth() -> int:
+    global _depth_sample
+    with _depth_lock:
+        taken_at, depth = _depth_sample
+        if time.monotonic() - taken_at >= DEPTH_METRIC_TTL:
+            with SessionLocal() as db:
+                depth = queue_depth(db)
+            _depth_sample = (time.monotonic(), depth)
+        return depth
+
+
+metrics.Callback("scoring_queue_depth", "Reviews waiting for the scoring worker.", _metrics_queue_depth)
+
+
+def enqueue_review(db: Session, payload: models.ReviewCreate) -> Review:
+    """Persist the review unscored together with its scoring job."""
+    if queue_depth(db) >= QUEUE_MAX:
+        raise QueueFull()
+    review = Review(
+        movie_id=payload.movie_id,
+        author=payload.author,
+        content=payload.content,
+        # sentiment_score is NOT NULL in existing databases; the real value arrives with the job
+        sentiment_score=0.0,
+        sentiment_status="pending",
+    )
+    db.add(review)
+    db.flush()
+    hooks.reviews_added(db, [(review.id, review.movie_id, review.content)])
+    db.add(ScoringJob(review_id=review.id))
+    db.commit()
+    db.refresh(review)
+    return review
+
+
+def process_batch(db: Session, batch_size: int = BATCH_SIZE) -> int:
+    """Claim up to batch_size due jobs, score them and store the results. Returns jobs handled."""
+    now = datetime.utcnow()
+    due = (
+        select(ScoringJob.id)
+        .where(
+            or_(
+                (ScoringJob.status == "queued") & (ScoringJob.available_at <= now),
+                (ScoringJob.status == "running") & (ScoringJob.claimed_at < now - CLAIM_TIMEOUT),
+            )
+        )
+        .order_by(ScoringJob.id)
+        .limit(batch_size)
+    )
+    job_ids = list(db.scalars(due))
+    if not job_ids:
+        return 0
+    # conditional claim so concurrent workers never take the same job
+    db.execute(
+        update(ScoringJob)
+        .where(ScoringJob.id.in_(job_ids), ScoringJob.claimed_at.is_(None) | (ScoringJob.claimed_at < now - CLAIM_TIMEOUT))
+        .values(status="running", claimed_at=now)
+    )
+    db.commit()
+    jobs = db.execute(
+        select(
+            ScoringJob.id, ScoringJob.review_id, ScoringJob.attempts, Review.content, Review.movie_id, Review.created_at
+        )
+        .join(Review, Review.id == ScoringJob.review_id)
+        .where(ScoringJob.id.in_(job_ids), ScoringJob.claimed_at == now)
+    ).all()
+    if not jobs:
+        return 0
+
+    try:
+        results = sentiment.analyze_batch([job.content for job in jobs])
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("scoring batch of %d failed: %s", len(jobs), exc)
+        _retry(db, jobs, str(exc))
+        return len(jobs)
+
+    try:
+        _store_scores(db, jobs, results, now)
+    except Exception as exc:  # noqa: BLE001
+        db.rollback()
+        logger.warning("storing scores for a batch of %d failed: %s", len(jobs), exc)
+        _retry(db, jobs, str(exc))
+    return len(jobs)
+
+
+def _store_scores(db: Session, jobs: List, results: List, claimed_at: datetime) -> None:
+    """Write the scores of the jobs this worker still holds; reviews deleted meanwhile are skipped."""
+    job_ids = [job.id for job in jobs]
+    # a job reclaimed after CLAIM_TIMEOUT has a newer claimed_at and is left to its new worker
+    held = (ScoringJob.id.in_(job_ids), ScoringJob.status == "running", ScoringJob.claimed_at == claimed_at)
+    scores = {job.review_id: result for job, result in zip(jobs, results)}
+    scored_ids = set(
+        db.scalars(
+            update(Review)
+            .where(Review.id.in_(select(ScoringJob.review_id).where(*held)))
+            .values(
+                sentiment_score=case({review_id: score for review_id, (score, _) in scores.items()}, value=Review.id),
+                sentiment_label=case({review_id: label for review_id, (_, label) in scores.items()}, value=Review.id),
+                sentiment_model=sentiment.model_tag(),
+                sentiment_status="done",
+            )
+            .returning(Review.id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+    hooks.reviews_scored(
+        db,
+        [
+            hooks.ScoredReview(job.review_id, job.movie_id, score, label, job.created_at)
+            for job, (score, label) in zip(jobs, results)
+            if job.review_id in scored_ids
+        ],
+    )
+    db.execute(delete(ScoringJob).where(*held))
+    db.commit()
+
+
+def _retry(db: Session, jobs: List, error: str) -> None:
+    now = datetime.utcnow()
+    for job in jobs:
+        attempts = job.attempts + 1
+        if attempts >= MAX_ATTEMPTS:
+            values = {"status": "failed", "attempts": attempts, "last_error": error}
+            db.execute(update(Review).where(Review.id == job.review_id).values(sentiment_status="failed"))
+            versions.bump(db, [versions.REVIEWS, versions.movie_key(job.movie_id)])
+        else:
+            # exponential backoff: 2s, 4s, 8s, ...
+            values = {
+                "status": "queued",
+                "attempts": attempts,
+                "last_error": error,
+                "available_at": now + timedelta(seconds=2**attempts),
+                "claimed_at": None,
+            }
+        db.execute(update(ScoringJob).where(ScoringJob.id == job.id).values(**values))
+    db.commit()
+
+
+class ScoringWorker:
+    """Background thread that drains scoring_jobs until stopped."""
+
+    def __init__(self, batch_size: int = BATCH_SIZE, poll_interval: float = POLL_INTERVAL) -> None:
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="scoring-worker", daemon=True)
+
+    def start(self) -> "ScoringWorker":
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        # scoring needs the model; don't burn retries while it is still loading
+        while not self._stop.is_set() and not sentiment.wait_until_ready(1.0):
+            pass
+        while not self._stop.is_set():
+            db = SessionLocal()
+            try:
+                handled = process_batch(db, self.batch_size)
+            except Exception:  # noqa: BLE001
+                logger.exception("scoring worker iteration failed")
+                handled = 0
+            finally:
+                db.close()
+            if not handled:
+                self._stop.wait(self.poll_interval)
+
+
+def main():
+    init_db()
+    sentiment.start_background_warmup()
+    worker = ScoringWorker().start()
+    print("Scoring worker running; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Score reviews with a missing or stale sentiment label and write the results back.
+
+Usage: python -m backend.scripts.backfill_sentiment [--batch-size 512] [--start-id 0] [--limit N] [--long-text]
+
+Rows are walked in primary-key order, so an interrupted run can be resumed with
+--start-id (the last processed id is printed with every progress line); rerunning
+without it is also safe because already-rescored rows no longer match the filter.
+"""
+import argparse
+import time
+
+from sqlalchemy import and_, func, or_, update
+
+from backend import hooks, sentiment
+from backend.db import Review, SessionLocal, init_db
+
+
+def stale_filter(tag: str):
+    return and_(
+        # write-behind rows are scored by their queued job
+        or_(Review.sentiment_status.is_(None), Review.sentiment_status != "pending"),
+        or_(
+            Review.sentiment_label.is_(None),
+            Review.sentiment_model.is_(None),
+            Review.sentiment_model != tag,
+        ),
+    )
+
+
+def backfill(batch_size: int = 512, start_id: int = 0, limit: int | None = None, long_text: bool = False) -> int:
+    init_db()
+    tag = sentiment.model_tag()
+    db = SessionLocal()
+    try:
+        total = db.query(func.count(Review.id)).filter(Review.id > start_id, stale_filter(tag)).scalar()
+        if limit is not None:
+            total = min(total, limit)
+        print(f"{total} reviews to score (model: {tag})")
+
+        done = 0
+        last_id = start_id
+        started = time.perf_counter()
+        while done < total:
+            rows = (
+                db.query(
+                    Review.id,
+                    Review.content,
+                    Review.movie_id,
+                    Review.sentiment_score,
+                    Review.sentiment_label,
+                    Review.sentiment_status,
+                    Review.created_at,
+                )
+                .filter(Review.id > last_id, stale_filter(tag))
+                .order_by(Review.id)
+                .limit(min(batch_size, total - done))
+                .all()
+            )
+            if not rows:
+                break
+
+            scorer = sentiment.analyze_long if long_text else sentiment.analyze_batch
+            results = scorer([row.content for row in rows])
+            db.execute(
+                update(Review),
+                [
+                    {
+                        "id": row.id,
+                        "sentiment_score": score,
+                        "sentiment_label": label,
+                        "sentiment_model": tag,
+                        "sentiment_status": "done",
+                    }
+                    for row, (score, label) in zip(rows, results)
+                ],
+            )
+            hooks.reviews_unscored(
+                db,
+                [
+                    hooks.ScoredReview(row.id, row.movie_id, row.sentiment_score, row.sentiment_label, row.created_at)
+                    for row in rows
+                    if row.sentiment_status in (None, "done")
+                ],
+            )
+            hooks.reviews_scored(
+                db,
+                [
+                    hooks.ScoredReview(row.id, row.movie_id, score, label, row.created_at)
+                    for row, (score, label) in zip(rows, results)
+                ],
+            )
+            db.commit()
+
+            done += len(rows)
+            last_id = rows[-1].id
+            elapsed = time.perf_counter() - started
+            print(f"{done}/{total} rows, last id {last_id}, {done / elapsed:.1f} rows/s")
+        return done
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--start-id", type=int, default=0, help="resume after this review id")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many rows")
+    parser.add_argument(
+        "--long-text", action="store_true", help="score whole reviews in overlapping windows instead of truncating"
+    )
+    args = parser.parse_args()
+    backfill(batch_size=args.batch_size, start_id=args.start_id, limit=args.limit, long_text=args.long_text)
+
+
+if __name__ == "__main__":
+    main()
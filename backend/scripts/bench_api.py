@@ -0,0 +1,278 @@
+"""Load test: mixed API workload with per-endpoint throughput and latency percentiles.
+
+Usage: python -m backend.scripts.bench_api [--target inprocess|uvicorn] [--concurrency 16] [--seconds 20]
+           [--mix create=1,reviews_by_movie=4,rating=4,movies=1] [--output results.json]
+           [--baseline baseline.json] [--threshold 0.2] [--save-baseline baseline.json]
+
+Runs fully offline against a fresh temporary SQLite database and the stand-in
+model from backend.scripts.make_stand_in_model, either in this process (ASGI
+transport, no sockets) or behind a local uvicorn. After seeding --movies movies
+with --reviews-per-movie reviews each, --concurrency clients pick operations
+from --mix (weights) for --seconds:
+  create            POST /reviews/ (a new text each time, so the result cache doesn't help)
+  reviews_by_movie  GET /reviews/movie/{id}
+  rating            GET /reviews/movie/{id}/rating
+  movies            GET /movies/
+Results (throughput and p50/p95/p99 per operation) are printed and written as
+JSON. With --baseline, an operation whose p95 rises or whose throughput falls by
+more than --threshold (a fraction), or that has more errors than in the
+baseline (whatever the threshold), counts as a regression and the exit status
+is 1. Baselines are machine-specific, so none is committed: record one with
+--save-baseline on main, on the machine that will run the comparison, then run
+the branch with --baseline.
+
+The database and model go in a new directory under BENCH_API_WORKDIR (default:
+the system temp directory); only that new directory is removed afterwards.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from backend.scripts import make_stand_in_model
+
+OPERATIONS = ("create", "reviews_by_movie", "rating", "movies")
+PHRASES = ["정말 재미있는 영화", "시간 낭비였어요", "배우들 연기가 좋네요", "스토리가 지루함", "다시 보고 싶다", "그냥 그래요"]
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))] * 1000
+
+
+async def _request(client, op: str, movie_ids, rng, counter) -> None:
+    movie_id = rng.choice(movie_ids)
+    if op == "create":
+        counter[0] += 1
+        text = f"{rng.choice(PHRASES)} {counter[0]}"
+        response = await client.post("/reviews/", json={"movie_id": movie_id, "author": "bench", "content": text})
+    elif op == "reviews_by_movie":
+        response = await client.get(f"/reviews/movie/{movie_id}", params={"page_size": 20})
+    elif op == "rating":
+        response = await client.get(f"/reviews/movie/{movie_id}/rating")
+    else:
+        response = await client.get("/movies/", params={"page_size": 50})
+    response.raise_for_status()
+
+
+async def _seed(client, movies: int, reviews_per_movie: int):
+    movie_ids = []
+    for i in range(movies):
+        payload = {"title": f"영화 {i}", "release_date": "2020-01-01", "director": "감독", "genre": "드라마"}
+        response = await client.post("/movies/", json=payload)
+        response.raise_for_status()
+        movie_ids.append(response.json()["id"])
+    rows = [
+        {"movie_id": movie_id, "author": "seed", "content": f"{PHRASES[n % len(PHRASES)]} seed {movie_id}-{n}"}
+        for movie_id in movie_ids
+        for n in range(reviews_per_movie)
+    ]
+    if rows:
+        response = await client.post("/reviews/bulk", json=rows, timeout=600)
+        response.raise_for_status()
+    return movie_ids
+
+
+async def _wait_ready(client, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except Exception:  # noqa: BLE001 - server still starting
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("API did not become ready")
+
+
+async def _drive(client, args) -> dict:
+    await _wait_ready(client)
+    movie_ids = await _seed(client, args.movies, args.reviews_per_movie)
+
+    ops, weights = zip(*args.mix.items())
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    counter = [0]
+    stop_at = time.perf_counter() + args.seconds
+
+    async def worker(n: int) -> None:
+        rng = random.Random(args.seed * 1000 + n)
+        while time.perf_counter() < stop_at:
+            op = rng.choices(ops, weights)[0]
+            started = time.perf_counter()
+            try:
+                await _request(client, op, movie_ids, rng, counter)
+                latencies[op].append(time.perf_counter() - started)
+            except Exception:  # noqa: BLE001 - counted, the run goes on
+                errors[op] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    def summarize(values, error_count):
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "errors": error_count,
+            "rps": len(values) / elapsed,
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "p99_ms": _percentile(values, 0.99),
+        }
+
+    operations = {op: summarize(latencies[op], errors[op]) for op in ops}
+    everything = [v for op in ops for v in latencies[op]]
+    return {"operations": operations, "total": summarize(everything, sum(errors.values())), "seconds": elapsed}
+
+
+async def _run_inprocess(args) -> dict:
+    import httpx
+
+    from backend.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await _drive(client, args)
+
+
+async def _run_uvicorn(args) -> dict:
+    import httpx
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    command = [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"]
+    server = subprocess.Popen(command)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            return await _drive(client, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Regressions of p95 latency or throughput beyond threshold, or more errors, as printable strings."""
+    regressions = []
+    for op, now in {**current["operations"], "total": current["total"]}.items():
+        base = baseline.get("total") if op == "total" else baseline.get("operations", {}).get(op)
+        base_errors = base.get("errors", 0) if base else 0
+        if now["errors"] > base_errors:
+            regressions.append(f"{op}: errors {base_errors} -> {now['errors']}")
+    for op, base in baseline.get("operations", {}).items():
+        now = current["operations"].get(op)
+        if not now or not base.get("requests"):
+            continue
+        if base["p95_ms"] and now["p95_ms"] and now["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{op}: p95 {base['p95_ms']:.1f} -> {now['p95_ms']:.1f} ms")
+        if now["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{op}: throughput {base['rps']:.1f} -> {now['rps']:.1f} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("create=1,reviews_by_movie=4,rating=4,movies=1"))
+    parser.add_argument("--movies", type=int, default=20)
+    parser.add_argument("--reviews-per-movie", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results JSON here (default: stdout only)")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", help="also write the results as a new baseline here")
+    args = parser.parse_args()
+
+    # _BENCH_API_RUN_DIR is only set by the re-exec below, for the directory this run created
+    workdir = os.environ.get("_BENCH_API_RUN_DIR")
+    if not workdir:
+        parent = os.environ.get("BENCH_API_WORKDIR") or None
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        workdir = tempfile.mkdtemp(prefix="bench-api-", dir=parent)
+    env = {
+        "_BENCH_API_RUN_DIR": workdir,
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "SENTIMENT_MODEL_DIR": os.path.join(workdir, "model"),
+        "SENTIMENT_SERVER_ADDRESS": "",
+        "SENTIMENT_CACHE_DB": "",
+        "POSTER_CACHE_DIR": os.path.join(workdir, "posters"),
+    }
+    if any(os.environ.get(key) != value for key, value in env.items()):
+        # backend modules read their settings at import time and `-m` has already imported
+        # backend (and with it backend.sentiment), so start over with the settings in place
+        os.execve(sys.executable, [sys.executable, "-m", __spec__.name, *sys.argv[1:]], {**os.environ, **env})
+
+    try:
+        make_stand_in_model.build(env["SENTIMENT_MODEL_DIR"])
+        run = _run_inprocess if args.target == "inprocess" else _run_uvicorn
+        result = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result["config"] = {
+        "target": args.target,
+        "concurrency": args.concurrency,
+        "seconds": args.seconds,
+        "mix": args.mix,
+        "movies": args.movies,
+        "reviews_per_movie": args.reviews_per_movie,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+    for op, r in {**result["operations"], "total": result["total"]}.items():
+        p50, p95, p99 = (f"{r[k]:7.1f}" if r[k] is not None else "      -" for k in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{op:>16}: {r['rps']:8.1f} req/s  p50 {p50}  p95 {p95}  p99 {p99} ms  errors {r['errors']}")
+
+    text = json.dumps(result, indent=2)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            f.write(text + "\n")
+    if not args.output:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changed = [k for k, v in baseline.get("config", {}).items() if result["config"].get(k) != v]
+        if changed:
+            print(f"warning: baseline was recorded with different settings ({', '.join(changed)})")
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"REGRESSION (threshold {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regression beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Read throughput and latency as concurrency grows, sync routes vs async routes.
+
+Usage: python -m backend.scripts.bench_async_routes [--concurrency 1,8,32,128] [--seconds 5] [--reviews 2000]
+
+Seeds a fresh SQLite file, then serves it with uvicorn twice:
+  sync   - DATABASE_URL=sqlite:///...          (def handlers, threadpool + sync pool)
+  async  - DATABASE_URL=sqlite+aiosqlite:///... (async handlers on AsyncSession)
+and drives GET /reviews/movie/{id} (one 20-row page, response cache off) from
+N concurrent clients per level. Writes are left out so the model is not needed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {"sync": "sqlite:///{path}", "async": "sqlite+aiosqlite:///{path}"}
+
+
+def _seed(path: str, reviews: int) -> int:
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from datetime import date, datetime, timedelta
+
+    from sqlalchemy import insert
+
+    from backend.db import Movie, Review, SessionLocal, init_db
+
+    init_db()
+    with SessionLocal() as db:
+        movie = Movie(title="bench", release_date=date(2020, 1, 1), director="d", genre="g")
+        db.add(movie)
+        db.flush()
+        start = datetime(2024, 1, 1)
+        db.execute(
+            insert(Review),
+            [
+                {
+                    "movie_id": movie.id,
+                    "author": f"user{i}",
+                    "content": "재미있어요",
+                    "sentiment_score": 0.5,
+                    "sentiment_label": "positive",
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(reviews)
+            ],
+        )
+        db.commit()
+        return movie.id
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _level(url: str, concurrency: int, seconds: float) -> dict:
+    import httpx
+
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else None
+
+    return {"rps": len(latencies) / elapsed, "p50_ms": pct(0.5), "p95_ms": pct(0.95), "errors": errors}
+
+
+def _serve(database_url: str, port: int) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": database_url, "RESPONSE_CACHE_SIZE": "0"}
+    command = [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"]
+    server = subprocess.Popen(command, env=env)
+    import httpx
+
+    for _ in range(300):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"server for {database_url} did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32,128", help="comma-separated client counts")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each level")
+    parser.add_argument("--reviews", type=int, default=2000)
+    args = parser.parse_args()
+    levels = [int(n) for n in args.concurrency.split(",")]
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    movie_id = _seed(path, args.reviews)
+
+    results = {}
+    for mode, template in MODES.items():
+        port = _free_port()
+        server = _serve(template.format(path=path), port)
+        try:
+            url = f"http://127.0.0.1:{port}/reviews/movie/{movie_id}?page_size=20"
+            asyncio.run(_level(url, 1, 1.0))  # warm up connections and statement caches
+            results[mode] = {}
+            for n in levels:
+                r = asyncio.run(_level(url, n, args.seconds))
+                results[mode][n] = r
+                print(
+                    f"{mode:>5} c={n:<4} {r['rps']:8.1f} req/s  p50 {r['p50_ms']:7.1f} ms  "
+                    f"p95 {r['p95_ms']:7.1f} ms  errors {r['errors']}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
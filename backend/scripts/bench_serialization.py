@@ -0,0 +1,113 @@
+"""Rows/second of GET /reviews/movie/{id}, ORM + pydantic path vs column rows + fast JSON.
+
+Usage: python -m backend.scripts.bench_serialization [--reviews 5000] [--page-size 500] [--repeat 20]
+
+Seeds one movie with --reviews reviews into a fresh temporary SQLite database and
+times building one response body of --page-size rows:
+  orm       - ORM instances, models.Review validation, FastAPI's jsonable_encoder + json
+  columns   - the endpoint's own path: column select, dict rows, serialization.dumps
+  endpoint  - full HTTP round trip through the app (response cache disabled)
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def _rate(fn, rows: int, repeat: int) -> float:
+    fn()  # warm caches / compile statements
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return rows * repeat / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ["RESPONSE_CACHE_SIZE"] = "0"
+
+    from datetime import date, datetime, timedelta
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert, select
+
+    from backend import models, serialization
+    from backend.api.reviews import _newest_first
+    from backend.db import Movie, Review, SessionLocal, init_db
+
+    init_db()
+    with SessionLocal() as db:
+        movie = Movie(title="bench", release_date=date(2020, 1, 1), director="d", genre="g")
+        db.add(movie)
+        db.flush()
+        start = datetime(2024, 1, 1)
+        db.execute(
+            insert(Review),
+            [
+                {
+                    "movie_id": movie.id,
+                    "author": f"user{i}",
+                    "content": "정말 재미있는 영화였어요 " * 5,
+                    "sentiment_score": 0.5,
+                    "sentiment_label": "positive",
+                    "sentiment_status": "done",
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(args.reviews)
+            ],
+        )
+        db.commit()
+        movie_id = movie.id
+
+    size = min(args.page_size, args.reviews)
+    db = SessionLocal()
+
+    def orm_path():
+        reviews = (
+            db.query(Review)
+            .filter(Review.movie_id == movie_id)
+            .order_by(Review.created_at.desc(), Review.id)
+            .limit(size)
+            .all()
+        )
+        body = [models.Review.model_validate(r, from_attributes=True) for r in reviews]
+        json.dumps(jsonable_encoder(body)).encode()
+        db.expunge_all()
+
+    def columns_path():
+        query = select(*serialization.REVIEW_COLUMNS).where(Review.movie_id == movie_id)
+        serialization.dumps(serialization.as_dicts(db.execute(_newest_first(query, None).limit(size))))
+
+    from backend.main import app
+
+    with TestClient(app) as client:
+
+        def endpoint():
+            response = client.get(f"/reviews/movie/{movie_id}", params={"page_size": size})
+            assert len(response.json()) == size
+
+        results = {
+            "orm": _rate(orm_path, size, args.repeat),
+            "columns": _rate(columns_path, size, args.repeat),
+            "endpoint": _rate(endpoint, size, args.repeat),
+        }
+    db.close()
+
+    encoder = "orjson" if serialization.orjson is not None else "json"
+    for name, rate in results.items():
+        print(f"{name:>8}: {rate:10.0f} rows/s")
+    print(f"columns vs orm: {results['columns'] / results['orm']:.1f}x (encoder: {encoder})")
+    print(json.dumps({**results, "encoder": encoder, "page_size": size}))
+
+
+if __name__ == "__main__":
+    main()
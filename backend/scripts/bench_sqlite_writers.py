@@ -0,0 +1,118 @@
+"""Concurrent review-writer throughput on SQLite, before and after the tuned profile.
+
+Usage: python -m backend.scripts.bench_sqlite_writers [--threads 16] [--writes 200]
+
+Each configuration runs in a fresh subprocess against a fresh database file:
+  baseline  - default rollback journal, no pragmas (SQLITE_TUNING=0)
+  tuned     - WAL, synchronous=NORMAL, busy_timeout, mmap, cache (SQLITE_TUNING=1)
+  grouped   - tuned + group commit (SQLITE_GROUP_COMMIT=1)
+Writers go through the same insert path as POST /reviews/ (review row plus
+aggregate update) with a fixed score, so the model is not involved.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+CONFIGS = {
+    "baseline": {"SQLITE_TUNING": "0", "SQLITE_GROUP_COMMIT": "0"},
+    "tuned": {"SQLITE_TUNING": "1", "SQLITE_GROUP_COMMIT": "0"},
+    "grouped": {"SQLITE_TUNING": "1", "SQLITE_GROUP_COMMIT": "1"},
+}
+
+
+def run_writers(threads: int, writes: int) -> dict:
+    """Runs inside the subprocess; the engine is configured from the environment."""
+    from datetime import date
+
+    from backend import group_commit, hooks, models, search
+    from backend.api.reviews import _insert_review
+    from backend.db import Movie, SessionLocal, init_db
+
+    # same startup as the app, so the search index is set up before the writers race for it
+    init_db()
+    with SessionLocal() as db:
+        search.ensure_initialized(db)
+        movie = Movie(title="bench", release_date=date(2020, 1, 1), director="d", genre="g")
+        db.add(movie)
+        db.flush()
+        hooks.movie_added(db, movie)
+        db.commit()
+        movie_id = movie.id
+    if group_commit.ENABLED:
+        group_commit.get_committer()
+
+    errors = []
+    ok = [0]
+    lock = threading.Lock()
+
+    def writer(n: int) -> None:
+        for i in range(writes):
+            payload = models.ReviewCreate(movie_id=movie_id, author=f"w{n}", content=f"review {n}-{i}")
+            try:
+                if group_commit.ENABLED:
+                    group_commit.get_committer().submit(lambda s: _insert_review(s, payload, 0.5, "positive"))
+                else:
+                    with SessionLocal() as db:
+                        _insert_review(db, payload, 0.5, "positive")
+                        db.commit()
+                with lock:
+                    ok[0] += 1
+            except Exception as exc:  # noqa: BLE001
+                with lock:
+                    errors.append(type(exc).__name__ + ": " + str(exc).splitlines()[0])
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "writes": ok[0],
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": elapsed,
+        "writes_per_s": ok[0] / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200, help="writes per thread")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_writers(args.threads, args.writes)))
+        return
+
+    results = {}
+    for name, env in CONFIGS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            child_env = {**os.environ, **env, "DATABASE_URL": f"sqlite:///{tmp}/bench.db"}
+            command = [
+                sys.executable,
+                "-m",
+                "backend.scripts.bench_sqlite_writers",
+                "--child",
+                "--threads",
+                str(args.threads),
+                "--writes",
+                str(args.writes),
+            ]
+            out = subprocess.run(command, env=child_env, capture_output=True, text=True, check=True)
+            results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+        r = results[name]
+        print(f"{name:>8}: {r['writes_per_s']:8.1f} writes/s, {r['writes']} ok, {r['errors']} errors")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
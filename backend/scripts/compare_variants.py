@@ -0,0 +1,73 @@
+"""Accuracy-vs-latency report for the fp32 and int8 sentiment models.
+
+Usage: python -m backend.scripts.compare_variants [--repeat 20]
+
+Runs the cases from test_sentiment_debug.py through both variants (bypassing the
+result cache) and prints per-variant accuracy, single-review latency and how far
+the int8 scores drift from fp32.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from backend import sentiment
+from test_sentiment_debug import TEST_CASES
+
+
+def evaluate(variant: str, repeat: int) -> dict:
+    session = sentiment.build_session(variant)
+    results = sentiment._score_batch([text for text, _ in TEST_CASES], session=session)
+
+    timings = []
+    for _ in range(repeat):
+        for text, _ in TEST_CASES:
+            started = time.perf_counter()
+            sentiment._score_batch([text], session=session)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    correct = sum(1 for (_, expected), (_, label) in zip(TEST_CASES, results) if label == expected)
+    return {
+        "variant": variant,
+        "model_bytes": sentiment._model_path(variant).stat().st_size,
+        "accuracy": correct / len(TEST_CASES),
+        "latency_ms_p50": statistics.median(timings),
+        "latency_ms_p95": timings[int(len(timings) * 0.95) - 1],
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timing passes over the test cases")
+    args = parser.parse_args()
+
+    sentiment.warmup()
+    if not sentiment.QUANTIZED_MODEL_PATH.exists():
+        print("Quantizing model...")
+        sentiment.quantize_model()
+
+    fp32 = evaluate("fp32", args.repeat)
+    int8 = evaluate("int8", args.repeat)
+
+    for report in (fp32, int8):
+        print(
+            f"{report['variant']:>5}: accuracy {report['accuracy']:.0%}, "
+            f"p50 {report['latency_ms_p50']:.1f} ms, p95 {report['latency_ms_p95']:.1f} ms, "
+            f"{report['model_bytes'] / 1e6:.0f} MB"
+        )
+
+    drift = [abs(a[0] - b[0]) for a, b in zip(fp32["results"], int8["results"])]
+    agree = sum(1 for a, b in zip(fp32["results"], int8["results"]) if a[1] == b[1])
+    summary = {
+        "label_agreement": agree / len(TEST_CASES),
+        "max_score_drift": max(drift),
+        "speedup_p50": fp32["latency_ms_p50"] / int8["latency_ms_p50"],
+        "variants": [{k: v for k, v in r.items() if k != "results"} for r in (fp32, int8)],
+    }
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
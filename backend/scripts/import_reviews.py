@@ -0,0 +1,50 @@
+"""Import reviews from an NDJSON file (one {"movie_id", "author", "content"} object per line).
+
+Usage: python -m backend.scripts.import_reviews reviews.ndjson [--chunk-size 500]
+
+The file is streamed, so memory stays bounded regardless of its size. Rows that
+fail validation or reference an unknown movie are listed at the end.
+"""
+import argparse
+import time
+
+from backend.db import SessionLocal, init_db
+from backend.ingest import CHUNK_SIZE, ReviewIngester
+
+
+def import_file(path: str, chunk_size: int = CHUNK_SIZE) -> dict:
+    init_db()
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        ingester = ReviewIngester(db, chunk_size=chunk_size)
+        with open(path, "rb") as fh:
+            batch = []
+            for row, line in enumerate(fh, 1):
+                batch.append((row, line))
+                if len(batch) >= chunk_size:
+                    ingester.feed(batch)
+                    batch = []
+                    elapsed = time.perf_counter() - started
+                    print(f"{row} rows read, {ingester.inserted} inserted, {ingester.inserted / elapsed:.1f} rows/s")
+            ingester.feed(batch)
+        ingester.flush()
+        return ingester.report()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    report = import_file(args.path, chunk_size=args.chunk_size)
+    print(f"Inserted {report['inserted']} reviews, {report['failed']} failed")
+    for error in report["errors"]:
+        print(f"  row {error['row']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
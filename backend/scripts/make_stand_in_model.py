@@ -0,0 +1,72 @@
+"""Write a tiny stand-in sentiment model (ONNX + tokenizer + config) for offline benchmarks.
+
+Usage: python -m backend.scripts.make_stand_in_model OUTPUT_DIR
+
+The directory has the same layout as backend/models, so SENTIMENT_MODEL_DIR=OUTPUT_DIR
+makes backend.sentiment load it without downloading anything. The tokenizer is a
+character-level WordPiece vocabulary (Hangul syllables, ASCII letters and digits)
+and the model averages a random 2-d embedding per token into negative/positive
+logits: the scores are meaningless, but tokenization, padding, session.run and
+post-processing all run for real, in a fraction of the real model's time.
+"""
+import argparse
+import json
+import string
+from pathlib import Path
+
+SEED = 0
+
+
+def build(output_dir: Path) -> Path:
+    import numpy as np
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from transformers import BertTokenizerFast
+
+    output_dir = Path(output_dir)
+    tokenizer_dir = output_dir / "tokenizer"
+    tokenizer_dir.mkdir(parents=True, exist_ok=True)
+
+    chars = [chr(c) for c in range(0xAC00, 0xD7A4)] + list(string.ascii_letters + string.digits + string.punctuation)
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + chars + [f"##{c}" for c in chars]
+    vocab_file = output_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab), encoding="utf-8")
+    BertTokenizerFast(vocab_file=str(vocab_file), do_lower_case=False).save_pretrained(tokenizer_dir)
+
+    embedding = np.random.default_rng(SEED).normal(size=(len(vocab), 2)).astype(np.float32)
+    inputs = [
+        helper.make_tensor_value_info(name, TensorProto.INT64, ["batch", "sequence"])
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+    ]
+    graph = helper.make_graph(
+        [
+            helper.make_node("Gather", ["embedding", "input_ids"], ["token_logits"]),
+            helper.make_node("ReduceMean", ["token_logits"], ["logits"], axes=[1], keepdims=0),
+        ],
+        "stand_in_sentiment",
+        inputs,
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch", 2])],
+        [numpy_helper.from_array(embedding, "embedding")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(output_dir / "model.onnx"))
+
+    config = {
+        "model_type": "bert",
+        "id2label": {"0": "negative", "1": "positive"},
+        "label2id": {"negative": 0, "positive": 1},
+    }
+    (output_dir / "config.json").write_text(json.dumps(config))
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir", type=Path)
+    args = parser.parse_args()
+    print(f"Stand-in model written to {build(args.output_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Measure how long a fresh server takes to accept requests and to become ready.
+
+Usage: python -m backend.scripts.measure_cold_start [--port 8765] [--timeout 600]
+
+Starts uvicorn in a subprocess, polls /health (liveness) and /ready (model loaded)
+and prints both times in seconds as JSON.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def _status(url: str) -> int | None:
+    try:
+        with urllib.request.urlopen(url, timeout=2) as resp:
+            return resp.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except OSError:
+        return None
+
+
+def measure(port: int, timeout: float) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    result = {"time_to_first_request_s": None, "time_to_ready_s": None}
+    try:
+        while time.monotonic() - started < timeout:
+            if result["time_to_first_request_s"] is None and _status(f"{base}/health") == 200:
+                result["time_to_first_request_s"] = time.monotonic() - started
+            if result["time_to_first_request_s"] is not None and _status(f"{base}/ready") == 200:
+                result["time_to_ready_s"] = time.monotonic() - started
+                break
+            time.sleep(0.05)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+    print(json.dumps(measure(args.port, args.timeout)))
+
+
+if __name__ == "__main__":
+    main()
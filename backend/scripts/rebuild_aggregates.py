@@ -0,0 +1,23 @@
+"""Recompute the per-movie review aggregates (movie_stats) from the reviews table.
+
+Usage: python -m backend.scripts.rebuild_aggregates
+"""
+import time
+
+from backend import aggregates
+from backend.db import SessionLocal, init_db
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        movies = aggregates.rebuild(db)
+        print(f"Rebuilt aggregates for {movies} movies in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
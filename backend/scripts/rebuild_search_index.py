@@ -0,0 +1,23 @@
+"""Rebuild the movie/review full-text search index from the database.
+
+Usage: python -m backend.scripts.rebuild_search_index
+"""
+import time
+
+from backend import search
+from backend.db import SessionLocal, init_db
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        search.rebuild(db)
+        print(f"Rebuilt search index in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
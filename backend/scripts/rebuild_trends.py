@@ -0,0 +1,23 @@
+"""Recompute the per-movie daily sentiment rollups (movie_daily_stats) from the reviews table.
+
+Usage: python -m backend.scripts.rebuild_trends
+"""
+import time
+
+from backend import trends
+from backend.db import SessionLocal, init_db
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = trends.rebuild(db)
+        print(f"Rebuilt {rows} daily trend rows in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""Full-text search over movie title/director/genre and review content.
+
+Korean has no spaces inside compound words and a word-level tokenizer would
+miss most substrings, so every word is indexed as overlapping character
+bigrams plus its single characters ("기생충" -> "기생 생충 기 생 충") and queries
+are split into bigrams, or kept whole when one character long (e.g. a
+one-syllable surname such as "봉"). On SQLite
+with FTS5 the bigrams live in two FTS5 tables whose rowids are the movie/review
+ids; elsewhere an in-process inverted index is used (per worker, rebuilt at startup).
+Both are kept in sync through backend.hooks.
+"""
+import logging
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from backend.db import IS_SQLITE, Movie, Review, engine
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# bm25 column weights for movies_fts(title, director, genre)
+_MOVIE_WEIGHTS = (3.0, 1.5, 1.0)
+
+
+def ngrams(value: Optional[str], unigrams: bool = False) -> List[str]:
+    """Bigrams of every word; one-character words are kept whole.
+
+    With unigrams (used for indexing) every character is added as well, so one-character
+    queries match inside longer words.
+    """
+    tokens = []
+    for word in _WORD_RE.findall((value or "").lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+            if unigrams:
+                tokens.extend(word)
+    return tokens
+
+
+def _doc(value: Optional[str]) -> str:
+    return " ".join(ngrams(value, unigrams=True))
+
+
+_FTS_TABLES = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5("
+    "title, director, genre, tokenize='unicode61 remove_diacritics 0')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5("
+    "content, movie_id UNINDEXED, tokenize='unicode61 remove_diacritics 0')",
+)
+
+
+def create_tables() -> bool:
+    """Create the FTS5 tables (SQLite only, run by init_db); False when SQLite lacks FTS5."""
+    try:
+        with engine.begin() as conn:
+            for ddl in _FTS_TABLES:
+                conn.execute(text(ddl))
+        return True
+    except OperationalError as exc:
+        # anything else, e.g. "database is locked", is a real error and must not switch the backend
+        if "no such module: fts5" not in str(exc):
+            raise
+        logger.warning("FTS5 unavailable, using in-process search index: %s", exc)
+        return False
+
+
+class _FtsBackend:
+    def add_movies(self, db: Session, movies: Iterable[Movie]) -> None:
+        rows = [
+            {"id": m.id, "title": _doc(m.title), "director": _doc(m.director), "genre": _doc(m.genre)} for m in movies
+        ]
+        if rows:
+            db.execute(
+                text("INSERT OR REPLACE INTO movies_fts(rowid, title, director, genre) VALUES (:id, :title, :director, :genre)"),
+                rows,
+            )
+
+    def add_reviews(self, db: Session, reviews: Iterable[Tuple[int, int, str]]) -> None:
+        rows = [{"id": rid, "movie_id": mid, "content": _doc(content)} for rid, mid, content in reviews]
+        if rows:
+            db.execute(
+                text("INSERT OR REPLACE INTO reviews_fts(rowid, content, movie_id) VALUES (:id, :content, :movie_id)"),
+                rows,
+            )
+
+    def remove_reviews(self, db: Session, review_ids: List[int]) -> None:
+        for start in range(0, len(review_ids), 500):
+            ids = review_ids[start : start + 500]
+            db.execute(text(f"DELETE FROM reviews_fts WHERE rowid IN ({','.join(map(str, map(int, ids)))})"))
+
+    def remove_movies(self, db: Session, movie_ids: List[int]) -> None:
+        ids = ",".join(str(int(i)) for i in movie_ids)
+        if not ids:
+            return
+        db.execute(text(f"DELETE FROM movies_fts WHERE rowid IN ({ids})"))
+        db.execute(text(f"DELETE FROM reviews_fts WHERE rowid IN (SELECT id FROM reviews WHERE movie_id IN ({ids}))"))
+
+    def clear(self, db: Session) -> None:
+        db.execute(text("DELETE FROM movies_fts"))
+        db.execute(text("DELETE FROM reviews_fts"))
+
+    def needs_rebuild(self, db: Session) -> bool:
+        """Empty, or filled before single characters were indexed (no one-character tokens)."""
+        rows = db.execute(text("SELECT title, director, genre FROM movies_fts LIMIT 50")).all()
+        if not rows:
+            return True
+        for row in rows:
+            tokens = " ".join(row).split()
+            if tokens and all(len(token) > 1 for token in tokens):
+                return True
+        return False
+
+    def search(self, db: Session, kind: str, tokens: List[str], limit: int, offset: int) -> List[Tuple[int, float]]:
+        # every bigram must occur; quoting keeps FTS5 query syntax out of user input
+        match = " AND ".join('"' + t.replace('"', '""') + '"' for t in dict.fromkeys(tokens))
+        if kind == "movies":
+            weights = ", ".join(map(str, _MOVIE_WEIGHTS))
+            sql = (
+                f"SELECT rowid, bm25(movies_fts, {weights}) AS rank FROM movies_fts "
+                "WHERE movies_fts MATCH :match ORDER BY rank LIMIT :limit OFFSET :offset"
+            )
+        else:
+            sql = (
+                "SELECT rowid, bm25(reviews_fts) AS rank FROM reviews_fts "
+                "WHERE reviews_fts MATCH :match ORDER BY rank LIMIT :limit OFFSET :offset"
+            )
+        rows = db.execute(text(sql), {"match": match, "limit": limit, "offset": offset}).all()
+        # bm25() is lower-is-better; expose higher-is-better scores
+        return [(int(rowid), -float(rank)) for rowid, rank in rows]
+
+
+class _MemoryBackend:
+    """Inverted index {token: {doc id: term frequency}} per kind, ranked by tf-idf."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.clear(None)
+
+    def setup(self) -> None:
+        pass
+
+    def clear(self, db: Optional[Session]) -> None:
+        self._postings: Dict[str, Dict[str, Dict[int, float]]] = {"movies": defaultdict(dict), "reviews": defaultdict(dict)}
+        self._docs: Dict[str, Dict[int, List[str]]] = {"movies": {}, "reviews": {}}
+        self._review_movie: Dict[int, int] = {}
+
+    def _add(self, kind: str, doc_id: int, weighted: List[Tuple[List[str], float]]) -> None:
+        self._remove(kind, doc_id)
+        counts: Dict[str, float] = defaultdict(float)
+        for tokens, weight in weighted:
+            for token in tokens:
+                counts[token] += weight
+        for token, tf in counts.items():
+            self._postings[kind][token][doc_id] = tf
+        self._docs[kind][doc_id] = list(counts)
+
+    def _remove(self, kind: str, doc_id: int) -> None:
+        for token in self._docs[kind].pop(doc_id, []):
+            self._postings[kind][token].pop(doc_id, None)
+
+    def add_movies(self, db: Session, movies: Iterable[Movie]) -> None:
+        with self._lock:
+            for m in movies:
+                fields = zip(
+                    (ngrams(m.title, True), ngrams(m.director, True), ngrams(m.genre, True)), _MOVIE_WEIGHTS
+                )
+                self._add("movies", m.id, list(fields))
+
+    def add_reviews(self, db: Session, reviews: Iterable[Tuple[int, int, str]]) -> None:
+        with self._lock:
+            for rid, mid, content in reviews:
+                self._add("reviews", rid, [(ngrams(content, True), 1.0)])
+                self._review_movie[rid] = mid
+
+    def remove_reviews(self, db: Session, review_ids: List[int]) -> None:
+        with self._lock:
+            for rid in review_ids:
+                self._remove("reviews", rid)
+                self._review_movie.pop(rid, None)
+
+    def remove_movies(self, db: Session, movie_ids: List[int]) -> None:
+        doomed = set(movie_ids)
+        with self._lock:
+            for mid in doomed:
+                self._remove("movies", mid)
+            for rid in [r for r, m in self._review_movie.items() if m in doomed]:
+                self._remove("reviews", rid)
+                self._review_movie.pop(rid, None)
+
+    def needs_rebuild(self, db: Session) -> bool:
+        return not self._docs["movies"]
+
+    def search(self, db: Session, kind: str, tokens: List[str], limit: int, offset: int) -> List[Tuple[int, float]]:
+        with self._lock:
+            postings = self._postings[kind]
+            total = max(len(self._docs[kind]), 1)
+            terms = list(dict.fromkeys(tokens))
+            lists = [postings.get(t, {}) for t in terms]
+            if not lists or any(not p for p in lists):
+                return []
+            candidates = set.intersection(*(set(p) for p in lists))
+            scored = [
+                (doc_id, sum(p[doc_id] * math.log(1 + total / len(p)) for p in lists)) for doc_id in candidates
+            ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[offset : offset + limit]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _get_backend(db: Session):
+    # published only once chosen, so concurrent first callers all wait for the same backend
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend(db)
+    return _backend
+
+
+def _create_backend(db: Session):
+    if IS_SQLITE:
+        # init_db creates the tables up front: a writer already holding SQLite's write lock
+        # could not create them on another connection, but can look them up in its own
+        exists = db.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'reviews_fts'")).first()
+        if exists or create_tables():
+            return _FtsBackend()
+    return _MemoryBackend()
+
+
+def index_movies(db: Session, movies: Iterable[Movie]) -> None:
+    _get_backend(db).add_movies(db, movies)
+
+
+def index_reviews(db: Session, reviews: Iterable[Tuple[int, int, str]]) -> None:
+    """reviews: (review id, movie id, content)."""
+    _get_backend(db).add_reviews(db, reviews)
+
+
+def remove_reviews(db: Session, review_ids: List[int]) -> None:
+    _get_backend(db).remove_reviews(db, list(review_ids))
+
+
+def remove_movies(db: Session, movie_ids: List[int]) -> None:
+    """Drop the movies and all of their reviews; call before the rows are deleted."""
+    _get_backend(db).remove_movies(db, list(movie_ids))
+
+
+def search(db: Session, query: str, kind: str, limit: int, offset: int = 0) -> List[Tuple[int, float]]:
+    """Ranked (id, score) pairs for kind "movies" or "reviews"; every query bigram must match."""
+    tokens = ngrams(query)
+    if not tokens:
+        return []
+    return _get_backend(db).search(db, kind, tokens, limit, offset)
+
+
+def rebuild(db: Session, batch_size: int = 1000) -> None:
+    backend = _get_backend(db)
+    backend.clear(db)
+    backend.add_movies(db, db.scalars(select(Movie)))
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(Review.id, Review.movie_id, Review.content).where(Review.id > last_id).order_by(Review.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        backend.add_reviews(db, [tuple(row) for row in rows])
+        last_id = rows[-1].id
+    db.commit()
+
+
+def ensure_initialized(db: Session) -> None:
+    """Fill the index when it is empty (new FTS tables, or the in-process fallback) or in an older
+    format, and movies exist."""
+    backend = _get_backend(db)
+    if backend.needs_rebuild(db) and db.execute(select(Movie.id).limit(1)).first():
+        rebuild(db)
@@ -1,37 +1,445 @@
+import ipaddress
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import numpy as np
-import onnxruntime as ort
-from transformers import AutoConfig, AutoTokenizer
+
+from backend import metrics
+from backend.sentiment_cache import SentimentCache, text_hash
+
+# onnxruntime and transformers are imported where they are first used, so importing
+# this module (and starting the web app) stays cheap; see start_background_warmup().
+if TYPE_CHECKING:
+    import onnxruntime as ort
+    from transformers import PreTrainedTokenizerBase
 
 # Fixed model ID (ignores env vars)
 MODEL_ID = "sangrimlee/bert-base-multilingual-cased-nsmc"
-MODEL_DIR = Path("backend/models")
+# point at another directory to use a different export, e.g. the stand-in from make_stand_in_model
+MODEL_DIR = Path(os.getenv("SENTIMENT_MODEL_DIR", "backend/models"))
 MODEL_PATH = MODEL_DIR / "model.onnx"
+QUANTIZED_MODEL_PATH = MODEL_DIR / "model.int8.onnx"
 TOKENIZER_PATH = MODEL_DIR / "tokenizer"
+MAX_LENGTH = 256
+
+# "fp32" (default) or "int8" (dynamically quantized copy of model.onnx)
+MODEL_VARIANT = os.getenv("SENTIMENT_MODEL_VARIANT", "fp32").lower()
+
+# ONNX Runtime session options; thread counts of 0 let ORT decide
+ORT_GRAPH_OPTIMIZATION = os.getenv("ORT_GRAPH_OPTIMIZATION", "all").lower()
+ORT_INTRA_OP_THREADS = int(os.getenv("ORT_INTRA_OP_THREADS", "0"))
+ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", "0"))
+# save the graph-optimized model next to the source and reuse it on later starts
+ORT_CACHE_OPTIMIZED_MODEL = os.getenv("ORT_CACHE_OPTIMIZED_MODEL", "0") == "1"
+
+_GRAPH_OPT_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+# Micro-batching: concurrent analyze() calls are merged into one ONNX batch.
+# Raise the wait for throughput, lower it for p99 latency; size 1 disables batching.
+BATCH_MAX_SIZE = int(os.getenv("SENTIMENT_BATCH_MAX_SIZE", "16"))
+BATCH_MAX_WAIT_MS = float(os.getenv("SENTIMENT_BATCH_MAX_WAIT_MS", "5"))
+# Rows per session.run for analyze_batch(); each chunk is padded only to its longest member.
+BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+
+# Long-text mode (analyze_long): reviews are split into MAX_LENGTH windows overlapping by
+# WINDOW_OVERLAP tokens, and windows from many reviews are packed into batches whose
+# padded size (rows x longest row) stays within TOKEN_BUDGET.
+TOKEN_BUDGET = int(os.getenv("SENTIMENT_TOKEN_BUDGET", "8192"))
+WINDOW_OVERLAP = int(os.getenv("SENTIMENT_WINDOW_OVERLAP", "64"))
+
+# Multi-worker mode: when set, API workers send texts to one shared inference process
+# (python -m backend.inference_server) instead of loading their own model copy.
+# A filesystem path is a unix socket in a directory private to the server's user; "host:port"
+# is TCP and must be a loopback address. Both ends need the same SENTIMENT_SERVER_AUTHKEY
+# (a random secret, e.g. `openssl rand -hex 32`); there is no default.
+SERVER_ADDRESS = os.getenv("SENTIMENT_SERVER_ADDRESS", "")
+SERVER_AUTHKEY = os.getenv("SENTIMENT_SERVER_AUTHKEY", "").encode()
+# largest request/response frame accepted from the other end
+SERVER_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+# Result cache: in-process LRU (0 disables); set SENTIMENT_CACHE_DB to persist/share it,
+# e.g. SENTIMENT_CACHE_DB=backend/sentiment_cache.db
+CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000"))
+CACHE_DB = os.getenv("SENTIMENT_CACHE_DB", "")
 
 
 def analyze(text: str) -> Tuple[float, str]:
     """Return (score 0~1, label in negative/neutral/positive)."""
-    warmup()
-    session = _get_session()
+    cache = _get_cache()
+    key = _cache_key(text)
+    cached = cache.get_many([key]).get(key)
+    if cached is not None:
+        return cached
+
+    if SERVER_ADDRESS:
+        result = _remote_call("analyze", text)
+    else:
+        warmup()
+        result = _score_one(text)
+    cache.put_many([(key, result)])
+    return result
+
+
+def analyze_batch(texts: List[str], batch_size: int = BATCH_SIZE) -> List[Tuple[float, str]]:
+    """Score many texts at once; results are returned in the input order."""
+    cache = _get_cache()
+    keys = [_cache_key(t) for t in texts]
+    found = cache.get_many(keys)
+    # score each distinct uncached text once
+    todo = {k: t for k, t in zip(keys, texts) if k not in found}
+    if todo:
+        if SERVER_ADDRESS:
+            results = _remote_call("analyze_batch", list(todo.values()))
+        else:
+            warmup()
+            results = _score_batch(list(todo.values()), batch_size)
+        scored = list(zip(todo.keys(), results))
+        cache.put_many(scored)
+        found.update(scored)
+    return [found[k] for k in keys]
+
+
+def analyze_long(texts: List[str], token_budget: int = TOKEN_BUDGET) -> List[Tuple[float, str]]:
+    """Like analyze_batch, but score the whole text instead of truncating at MAX_LENGTH tokens.
+
+    Window logits are averaged (weighted by window length) into one score per review.
+    """
+    cache = _get_cache()
+    keys = [(f"{model_tag()}#long", key[1]) for key in map(_cache_key, texts)]
+    found = cache.get_many(keys)
+    todo = {k: t for k, t in zip(keys, texts) if k not in found}
+    if todo:
+        if SERVER_ADDRESS:
+            results = _remote_call("analyze_long", list(todo.values()))
+        else:
+            warmup()
+            results = _score_long(list(todo.values()), token_budget)
+        scored = list(zip(todo.keys(), results))
+        cache.put_many(scored)
+        found.update(scored)
+    return [found[k] for k in keys]
+
+
+def model_tag() -> str:
+    """Identifier stored with each score so results from a different model can be detected."""
+    if MODEL_VARIANT == "int8":
+        return f"{MODEL_ID}@int8"
+    return MODEL_ID
+
+
+def cache_stats() -> dict:
+    return _get_cache().stats()
+
+
+_warmup_lock = threading.Lock()
+
+
+def warmup() -> None:
+    if SERVER_ADDRESS:
+        _remote_call("ping", None)
+        return
+    # serialized so a request arriving mid-load does not build a second session
+    with _warmup_lock:
+        _ensure_model_files()
+        _get_session()
+        _get_tokenizer()
+        _get_labels()
+
+
+_ready = threading.Event()
+_readiness = {"status": "not_started", "error": None, "load_seconds": None}
+
+
+def start_background_warmup() -> threading.Thread:
+    """Load (and if needed export) the model in a daemon thread; see readiness()."""
+    thread = threading.Thread(target=_warmup_until_ready, name="sentiment-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def _warmup_until_ready() -> None:
+    _readiness["status"] = "loading"
+    started = time.monotonic()
+    delay = 1.0
+    while True:
+        try:
+            warmup()
+            break
+        except Exception as exc:  # noqa: BLE001
+            # e.g. the shared inference server is not up yet; keep trying
+            _readiness["error"] = str(exc)
+            time.sleep(delay)
+            delay = min(delay * 2, 30.0)
+    _readiness.update(status="ready", error=None, load_seconds=time.monotonic() - started)
+    _ready.set()
+
+
+def wait_until_ready(timeout: Optional[float]) -> bool:
+    return _ready.wait(timeout)
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def readiness() -> dict:
+    return dict(_readiness)
+
+
+class _BatchScheduler:
+    """Gather concurrent requests for up to max_wait_ms (or max_batch_size items) and score them together."""
+
+    def __init__(self, max_batch_size: int, max_wait_ms: float) -> None:
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Tuple[float, str]:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                results = _score_batch([text for text, _ in batch])
+            except Exception as exc:  # noqa: BLE001
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+def _score_one(text: str) -> Tuple[float, str]:
+    if BATCH_MAX_SIZE <= 1:
+        return _score_batch([text])[0]
+    return _get_scheduler().submit(text)
+
+
+_remote = threading.local()
+
+
+def parse_address(address: str):
+    """Unix socket path, or (host, port) for "host:port"; TCP hosts other than loopback are refused."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        host = host.strip("[]") or "127.0.0.1"
+        if host != "localhost":
+            try:
+                loopback = ipaddress.ip_address(host).is_loopback
+            except ValueError:
+                loopback = False
+            if not loopback:
+                raise ValueError(f"inference server address must be a unix socket or loopback host:port, got {host!r}")
+        return host, int(port)
+    return address
+
+
+def check_server_settings(address: str = SERVER_ADDRESS) -> None:
+    """Fail fast on a missing authkey or a non-loopback address for the inference server."""
+    if not SERVER_AUTHKEY:
+        raise RuntimeError("SENTIMENT_SERVER_AUTHKEY must be set when using the inference server")
+    try:
+        parse_address(address)
+    except ValueError as exc:
+        raise RuntimeError(str(exc)) from None
+
+
+# Messages are JSON (never pickle) in multiprocessing.connection frames, after its HMAC authkey handshake.
+def send_message(conn, message) -> None:
+    conn.send_bytes(json.dumps(message, ensure_ascii=False).encode("utf-8"))
+
+
+def recv_message(conn):
+    return json.loads(conn.recv_bytes(SERVER_MAX_MESSAGE_BYTES))
+
+
+def _remote_call(op: str, payload):
+    from multiprocessing.connection import Client
+
+    for attempt in range(2):
+        conn = getattr(_remote, "conn", None)
+        try:
+            if conn is None:
+                conn = Client(parse_address(SERVER_ADDRESS), authkey=SERVER_AUTHKEY)
+                _remote.conn = conn
+            send_message(conn, [op, payload])
+            ok, result = recv_message(conn)
+        except (EOFError, OSError):
+            # server restarted or connection dropped: reconnect once
+            _remote.conn = None
+            if attempt:
+                raise
+            continue
+        if not ok:
+            raise RuntimeError(f"inference server error: {result}")
+        # (score, label) pairs arrive as JSON arrays
+        if op == "analyze":
+            return tuple(result)
+        if op in ("analyze_batch", "analyze_long"):
+            return [tuple(r) for r in result]
+        return result
+
+
+_scheduler: Optional[_BatchScheduler] = None
+_cache: Optional[SentimentCache] = None
+_singleton_lock = threading.Lock()
+
+
+def _get_scheduler() -> _BatchScheduler:
+    # one scheduler thread per process, even when the first requests arrive together
+    global _scheduler
+    if _scheduler is None:
+        with _singleton_lock:
+            if _scheduler is None:
+                _scheduler = _BatchScheduler(BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS)
+    return _scheduler
+
+
+def _get_cache() -> SentimentCache:
+    global _cache
+    if _cache is None:
+        with _singleton_lock:
+            if _cache is None:
+                _cache = SentimentCache(CACHE_SIZE, CACHE_DB or None)
+    return _cache
+
+
+def _cache_lookups() -> dict:
+    stats = cache_stats()
+    return {("hit",): stats["hits"], ("miss",): stats["misses"]}
+
+
+metrics.Callback(
+    "sentiment_cache_lookups_total", "Result cache lookups.", _cache_lookups, labels=("result",), kind="counter"
+)
+metrics.Callback(
+    "sentiment_batch_queue_depth",
+    "Texts waiting for the micro-batching scheduler.",
+    lambda: _scheduler.depth() if _scheduler is not None else 0,
+)
+
+
+def _cache_key(text: str) -> Tuple[str, str]:
+    return model_tag(), text_hash(text)
+
+
+def _score_batch(texts: List[str], batch_size: int = BATCH_SIZE, session=None) -> List[Tuple[float, str]]:
+    if not texts:
+        return []
     tokenizer = _get_tokenizer()
-    labels = _get_labels()
-
-    inputs = tokenizer(
-        text,
-        return_tensors="np",
-        truncation=True,
-        max_length=256,
-        padding="max_length",
-    )
-    ort_inputs = {k: v.astype("int64") for k, v in inputs.items()}
-    logits = session.run(None, ort_inputs)[0]
-    probs = _softmax(logits[0])
 
-    norm_labels = [str(lb).lower() for lb in labels]
+    # tokenize unpadded, then bucket by length so short reviews are not padded to long ones
+    started = time.perf_counter()
+    encoded = tokenizer(list(texts), truncation=True, max_length=MAX_LENGTH)
+    metrics.SENTIMENT_STAGE_SECONDS.observe(time.perf_counter() - started, "tokenize")
+    order = sorted(range(len(texts)), key=lambda i: len(encoded["input_ids"][i]))
+
+    results: List[Tuple[float, str]] = [None] * len(texts)  # type: ignore[list-item]
+    size = max(1, batch_size)
+    for start in range(0, len(order), size):
+        chunk = order[start : start + size]
+        with metrics.SENTIMENT_STAGE_SECONDS.time("tokenize"):
+            features = [{k: encoded[k][i] for k in encoded.keys()} for i in chunk]
+            padded = tokenizer.pad(features, padding="longest", return_tensors="np")
+        for i, result in zip(chunk, _run_padded(padded, session)):
+            results[i] = result
+    return results
+
+
+def _run_padded(inputs, session=None) -> List[Tuple[float, str]]:
+    logits = _run_logits(inputs, session)
+    with metrics.SENTIMENT_STAGE_SECONDS.time("postprocess"):
+        return [_postprocess(row) for row in logits]
+
+
+def _run_logits(inputs, session=None) -> np.ndarray:
+    ort_inputs = {k: np.asarray(v, dtype=np.int64) for k, v in inputs.items()}
+    session = session or _get_session()
+    metrics.SENTIMENT_BATCH_SIZE.observe(len(ort_inputs["input_ids"]))
+    with metrics.SENTIMENT_STAGE_SECONDS.time("inference"):
+        return session.run(None, ort_inputs)[0]
+
+
+def _score_long(texts: List[str], token_budget: int = TOKEN_BUDGET, session=None) -> List[Tuple[float, str]]:
+    if not texts:
+        return []
+    tokenizer = _get_tokenizer()
+    body = MAX_LENGTH - tokenizer.num_special_tokens_to_add()
+    step = max(1, body - WINDOW_OVERLAP)
+
+    # (review index, window ids with special tokens)
+    windows: List[Tuple[int, List[int]]] = []
+    started = time.perf_counter()
+    for i, ids in enumerate(tokenizer(list(texts), add_special_tokens=False, verbose=False)["input_ids"]):
+        starts = range(0, max(len(ids) - WINDOW_OVERLAP, 1), step)
+        for start in starts:
+            windows.append((i, tokenizer.build_inputs_with_special_tokens(ids[start : start + body])))
+    metrics.SENTIMENT_STAGE_SECONDS.observe(time.perf_counter() - started, "tokenize")
+
+    logit_sums: List[Optional[np.ndarray]] = [None] * len(texts)
+    weights = [0] * len(texts)
+    order = sorted(range(len(windows)), key=lambda w: len(windows[w][1]))
+    start = 0
+    while start < len(order):
+        # windows are length-sorted, so the last one added sets the padded width
+        end = start + 1
+        while end < len(order) and (end - start + 1) * len(windows[order[end]][1]) <= token_budget:
+            end += 1
+        chunk = order[start:end]
+        with metrics.SENTIMENT_STAGE_SECONDS.time("tokenize"):
+            features = [{"input_ids": windows[w][1]} for w in chunk]
+            padded = dict(tokenizer.pad(features, padding="longest", return_tensors="np"))
+            if "token_type_ids" not in padded:
+                padded["token_type_ids"] = np.zeros_like(padded["input_ids"])
+        for w, row in zip(chunk, _run_logits(padded, session)):
+            review, ids = windows[w]
+            n = len(ids)
+            logit_sums[review] = row * n if logit_sums[review] is None else logit_sums[review] + row * n
+            weights[review] += n
+        start = end
+
+    with metrics.SENTIMENT_STAGE_SECONDS.time("postprocess"):
+        return [_postprocess(total / weight) for total, weight in zip(logit_sums, weights)]
+
+
+def _postprocess(logits: np.ndarray) -> Tuple[float, str]:
+    probs = _softmax(logits)
+
+    norm_labels = [str(lb).lower() for lb in _get_labels()]
     num_labels = len(norm_labels)
     max_idx = int(np.argmax(probs))
 
@@ -50,13 +458,6 @@ def analyze(text: str) -> Tuple[float, str]:
     return score, sentiment_label
 
 
-def warmup() -> None:
-    _ensure_model_files()
-    _get_session()
-    _get_tokenizer()
-    _get_labels()
-
-
 def _positive_index(labels: List[str], num_labels: int) -> int:
     for i, lb in enumerate(labels):
         if "positive" in lb or "pos" in lb or "긍정" in lb:
@@ -105,19 +506,54 @@ def _softmax(x: np.ndarray) -> np.ndarray:
 
 
 @lru_cache(maxsize=1)
-def _get_session() -> ort.InferenceSession:
+def _get_session() -> "ort.InferenceSession":
+    return build_session(MODEL_VARIANT)
+
+
+def build_session(variant: str) -> "ort.InferenceSession":
+    """Create a CPU session for the given variant using the ORT_* session settings."""
+    import onnxruntime as ort
+
+    model_path = _model_path(variant)
+    options = ort.SessionOptions()
+    options.graph_optimization_level = getattr(
+        ort.GraphOptimizationLevel, _GRAPH_OPT_LEVELS.get(ORT_GRAPH_OPTIMIZATION, "ORT_ENABLE_ALL")
+    )
+    options.intra_op_num_threads = ORT_INTRA_OP_THREADS
+    options.inter_op_num_threads = ORT_INTER_OP_THREADS
+
+    if ORT_CACHE_OPTIMIZED_MODEL:
+        optimized = model_path.with_name(f"{model_path.stem}.{ORT_GRAPH_OPTIMIZATION}.opt.onnx")
+        if optimized.exists() and optimized.stat().st_mtime >= model_path.stat().st_mtime:
+            model_path = optimized
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        else:
+            options.optimized_model_filepath = str(optimized)
+
     providers = ["CPUExecutionProvider"]
-    return ort.InferenceSession(str(MODEL_PATH), providers=providers)
+    return ort.InferenceSession(str(model_path), sess_options=options, providers=providers)
+
+
+def _model_path(variant: str) -> Path:
+    if variant == "int8":
+        return QUANTIZED_MODEL_PATH
+    if variant != "fp32":
+        raise ValueError(f"Unknown SENTIMENT_MODEL_VARIANT: {variant}")
+    return MODEL_PATH
 
 
 @lru_cache(maxsize=1)
-def _get_tokenizer() -> AutoTokenizer:
+def _get_tokenizer() -> "PreTrainedTokenizerBase":
+    from transformers import AutoTokenizer
+
     return AutoTokenizer.from_pretrained(TOKENIZER_PATH)
 
 
 @lru_cache(maxsize=1)
 def _get_labels() -> List[str]:
     try:
+        from transformers import AutoConfig
+
         cfg = AutoConfig.from_pretrained(MODEL_DIR)
         id2label = getattr(cfg, "id2label", None)
         if id2label:
@@ -128,14 +564,24 @@ def _get_labels() -> List[str]:
 
 
 def _ensure_model_files() -> None:
-    if MODEL_PATH.exists() and TOKENIZER_PATH.exists():
-        return
-    _export_onnx()
+    if not (MODEL_PATH.exists() and TOKENIZER_PATH.exists()):
+        _export_onnx()
+    if MODEL_VARIANT == "int8" and not QUANTIZED_MODEL_PATH.exists():
+        quantize_model()
 
 
 def download_model() -> None:
     """Render build step helper: pre-download and export ONNX artifacts."""
     warmup()
+    if not QUANTIZED_MODEL_PATH.exists():
+        quantize_model()
+
+
+def quantize_model() -> None:
+    """Write a dynamically quantized (INT8 weights) copy of model.onnx."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(MODEL_PATH), str(QUANTIZED_MODEL_PATH), weight_type=QuantType.QInt8)
 
 
 def _export_onnx() -> None:
@@ -143,6 +589,7 @@ def _export_onnx() -> None:
         from optimum.onnxruntime import ORTModelForSequenceClassification
     except ImportError as exc:
         raise RuntimeError("optimum.onnxruntime is required. Install with: pip install 'optimum[onnxruntime]'") from exc
+    from transformers import AutoTokenizer
 
     MODEL_DIR.mkdir(parents=True, exist_ok=True)
     TOKENIZER_PATH.mkdir(parents=True, exist_ok=True)
@@ -156,3 +603,4 @@ def _export_onnx() -> None:
 
     model.save_pretrained(MODEL_DIR)
     tokenizer.save_pretrained(TOKENIZER_PATH)
+    quantize_model()
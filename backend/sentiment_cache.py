@@ -0,0 +1,166 @@
+import atexit
+import hashlib
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Key = Tuple[str, str]
+Result = Tuple[float, str]
+
+_WS_RE = re.compile(r"\s+")
+# rows the background writer inserts per commit at most
+WRITE_BATCH = 500
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """Hash of the normalized text (NFC, trimmed, whitespace collapsed)."""
+    normalized = _WS_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """LRU cache of (model id, text hash) -> (score, label), optionally backed by a SQLite file.
+
+    The SQLite table lets scores survive restarts and be shared by every uvicorn worker
+    on the host; the in-process LRU keeps hot entries off disk. New entries reach the
+    table through a background writer, so a request never waits for a disk commit.
+    """
+
+    def __init__(self, max_entries: int, db_path: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Key, Result]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.persistent_hits = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        # the LRU and the connection have separate locks so lookups don't wait for disk reads
+        self._store_lock = threading.Lock()
+        self._pending: "queue.Queue[Tuple[Key, Result]]" = queue.Queue()
+        if db_path:
+            self._conn = _open_store(db_path)
+            threading.Thread(
+                target=self._write_behind, args=(db_path,), name="sentiment-cache-writer", daemon=True
+            ).start()
+            # scripts exit right after scoring; don't drop what the writer hasn't stored yet
+            atexit.register(self.flush)
+
+    def get_many(self, keys: List[Key]) -> Dict[Key, Result]:
+        found: Dict[Key, Result] = {}
+        missing: List[Key] = []
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                else:
+                    missing.append(key)
+        loaded: Dict[Key, Result] = {}
+        if missing and self._conn is not None:
+            with self._store_lock:
+                loaded = self._load(missing)
+        with self._lock:
+            for key, result in loaded.items():
+                found[key] = result
+                self.persistent_hits += 1
+                self._remember(key, result)
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[Key, Result]]) -> None:
+        items = list(items)
+        with self._lock:
+            for key, result in items:
+                self._remember(key, result)
+        if self._conn is not None:
+            for item in items:
+                self._pending.put(item)
+
+    def flush(self) -> None:
+        """Wait until everything passed to put_many so far is in the SQLite table."""
+        self._pending.join()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "persistent_hits": self.persistent_hits,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self._conn is not None,
+            }
+
+    def _remember(self, key: Key, result: Result) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _write_behind(self, db_path: str) -> None:
+        conn = _open_store(db_path)
+        while True:
+            items = [self._pending.get()]
+            while len(items) < WRITE_BATCH:
+                try:
+                    items.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache (model_id, text_hash, score, label) VALUES (?, ?, ?, ?)",
+                    [(k[0], k[1], r[0], r[1]) for k, r in items],
+                )
+                conn.commit()
+            except sqlite3.Error as exc:
+                # only the persistent copy is lost; the texts are scored again on a later miss
+                logger.warning("sentiment cache: dropping %d writes: %s", len(items), exc)
+            finally:
+                for _ in items:
+                    self._pending.task_done()
+
+    def _load(self, keys: List[Key]) -> Dict[Key, Result]:
+        found: Dict[Key, Result] = {}
+        # keep well under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 400):
+            chunk = keys[start : start + 400]
+            placeholders = ",".join("(?, ?)" for _ in chunk)
+            params = [part for key in chunk for part in key]
+            rows = self._conn.execute(
+                f"SELECT model_id, text_hash, score, label FROM sentiment_cache "
+                f"WHERE (model_id, text_hash) IN (VALUES {placeholders})",
+                params,
+            ).fetchall()
+            for model_id, digest, score, label in rows:
+                found[(model_id, digest)] = (float(score), label)
+        return found
+
+
+def _open_store(db_path: str) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    # WAL lets several workers read while one writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+        "model_id TEXT NOT NULL, text_hash TEXT NOT NULL, score REAL NOT NULL, label TEXT NOT NULL, "
+        "PRIMARY KEY (model_id, text_hash))"
+    )
+    conn.commit()
+    return conn
@@ -0,0 +1,46 @@
+"""Fast path for large read responses: column rows in, JSON bytes out.
+
+List endpoints select just the columns the response needs (no ORM instances)
+and encode the resulting dicts directly, without a pydantic round trip. The
+shapes match models.Movie / models.Review. orjson is used when installed and
+the stdlib json module otherwise.
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List
+
+from backend.db import Movie, Review
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+MOVIE_COLUMNS = (Movie.title, Movie.release_date, Movie.director, Movie.genre, Movie.poster_url, Movie.id)
+REVIEW_COLUMNS = (
+    Review.movie_id,
+    Review.author,
+    Review.content,
+    Review.id,
+    Review.sentiment_score,
+    Review.created_at,
+    Review.sentiment_label,
+    Review.sentiment_status,
+)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+def as_dicts(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Result rows (from a select of *_COLUMNS) as plain dicts keyed by column name."""
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,123 @@
+"""Sentiment over time per movie (table movie_daily_stats).
+
+One row per movie and UTC day with the same totals as movie_stats, updated
+incrementally through backend.hooks. Weekly and monthly buckets are summed from
+the daily rows at read time; rebuild() recomputes everything from reviews.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from backend import versions
+from backend.aggregates import LABEL_COLUMNS, counted
+from backend.db import MovieDailyStats, Review
+
+BUCKETS = ("day", "week", "month")
+
+
+def _bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def apply(db: Session, reviews: Iterable, sign: int = 1) -> None:
+    deltas = defaultdict(lambda: defaultdict(float))
+    for review in reviews:
+        day = (review.created_at or datetime.utcnow()).date()
+        delta = deltas[(review.movie_id, day)]
+        delta["review_count"] += sign
+        delta["score_sum"] += sign * review.score
+        column = LABEL_COLUMNS.get(review.label or "")
+        if column:
+            delta[column] += sign
+
+    for (movie_id, day), delta in deltas.items():
+        values = {name: getattr(MovieDailyStats, name) + amount for name, amount in delta.items()}
+        result = db.execute(
+            update(MovieDailyStats)
+            .where(MovieDailyStats.movie_id == movie_id, MovieDailyStats.day == day)
+            .values(**values)
+        )
+        if result.rowcount == 0 and sign > 0:
+            db.execute(
+                insert(MovieDailyStats).values(
+                    movie_id=movie_id,
+                    day=day,
+                    review_count=int(delta["review_count"]),
+                    score_sum=delta["score_sum"],
+                    **{name: int(delta[name]) for name in LABEL_COLUMNS.values()},
+                )
+            )
+
+
+def drop(db: Session, movie_ids: List[int]) -> None:
+    db.execute(delete(MovieDailyStats).where(MovieDailyStats.movie_id.in_(movie_ids)))
+
+
+def get(
+    db: Session, movie_id: int, bucket: str = "day", since: Optional[date] = None, until: Optional[date] = None
+) -> List[Dict]:
+    """Buckets in date order with review count, mean score and label counts; empty buckets are omitted."""
+    query = select(MovieDailyStats).where(MovieDailyStats.movie_id == movie_id).order_by(MovieDailyStats.day)
+    if since:
+        query = query.where(MovieDailyStats.day >= since)
+    if until:
+        query = query.where(MovieDailyStats.day <= until)
+
+    points: Dict[date, Dict] = {}
+    for row in db.scalars(query):
+        if not row.review_count:
+            continue
+        start = _bucket_start(row.day, bucket)
+        point = points.setdefault(
+            start, {"start": start, "review_count": 0, "score_sum": 0.0, **{label: 0 for label in LABEL_COLUMNS}}
+        )
+        point["review_count"] += row.review_count
+        point["score_sum"] += row.score_sum
+        for label, column in LABEL_COLUMNS.items():
+            point[label] += getattr(row, column)
+
+    return [
+        {
+            "start": p["start"],
+            "review_count": p["review_count"],
+            "average_sentiment": p["score_sum"] / p["review_count"],
+            "label_counts": {label: p[label] for label in LABEL_COLUMNS},
+        }
+        for p in points.values()
+    ]
+
+
+def rebuild(db: Session) -> int:
+    """Recompute movie_daily_stats from scratch in one transaction. Returns the number of rows."""
+    db.execute(delete(MovieDailyStats))
+    day = func.date(Review.created_at)
+    label_sums = [func.sum(case((Review.sentiment_label == label, 1), else_=0)) for label in LABEL_COLUMNS]
+    grouped = (
+        select(Review.movie_id, day, func.count(Review.id), func.sum(Review.sentiment_score), *label_sums)
+        .where(counted(), Review.created_at.is_not(None))
+        .group_by(Review.movie_id, day)
+    )
+    db.execute(
+        insert(MovieDailyStats).from_select(
+            ["movie_id", "day", "review_count", "score_sum", *LABEL_COLUMNS.values()],
+            grouped,
+        )
+    )
+    versions.bump_all(db)
+    db.commit()
+    return db.scalar(select(func.count()).select_from(MovieDailyStats))
+
+
+def ensure_initialized(db: Session) -> None:
+    """Populate movie_daily_stats the first time it exists next to an already populated reviews table."""
+    if db.scalar(select(func.count()).select_from(MovieDailyStats)) == 0 and db.scalar(
+        select(func.count(Review.id)).where(counted())
+    ):
+        rebuild(db)
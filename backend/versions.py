@@ -0,0 +1,50 @@
+"""Version counters that tell readers when cached responses went stale.
+
+Writes bump the keys they affect inside their own transaction (through
+backend.hooks); read endpoints derive their ETag from the current versions
+of the keys they depend on. The counters live in the database, so every
+worker sees the same versions.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from backend.db import DataVersion
+
+MOVIES = "movies"
+REVIEWS = "reviews"
+
+
+def movie_key(movie_id: int) -> str:
+    """Reviews, rating and trend of one movie."""
+    return f"movie:{movie_id}"
+
+
+def bump(db: Session, keys: Iterable[str]) -> None:
+    now = datetime.utcnow()
+    for key in sorted(set(keys)):
+        result = db.execute(
+            update(DataVersion).where(DataVersion.key == key).values(version=DataVersion.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            db.execute(insert(DataVersion).values(key=key, version=1, updated_at=now))
+
+
+def bump_all(db: Session) -> None:
+    """Invalidate every cached response, e.g. after derived data was rebuilt in bulk."""
+    db.execute(update(DataVersion).values(version=DataVersion.version + 1, updated_at=datetime.utcnow()))
+    bump(db, [MOVIES, REVIEWS])
+
+
+def current(db: Session, keys: List[str]) -> Tuple[List[int], Optional[datetime]]:
+    """Versions in the order of keys (0 if never written) and the latest change time."""
+    rows: Dict[str, Tuple[int, datetime]] = {
+        key: (version, updated_at)
+        for key, version, updated_at in db.execute(
+            select(DataVersion.key, DataVersion.version, DataVersion.updated_at).where(DataVersion.key.in_(keys))
+        )
+    }
+    stamps = [rows[k][1] for k in keys if k in rows]
+    return [rows[k][0] if k in rows else 0 for k in keys], max(stamps) if stamps else None
@@ -1,31 +1,179 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
 import requests
-from typing import Any, Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+T = TypeVar("T")
+
+# keep-alive 연결 풀: Streamlit rerun마다 새 TCP/TLS 연결을 맺지 않도록 프로세스 전체에서 공유
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "16"))
+# GET만 재시도 (POST/DELETE는 중복 실행될 수 있으므로 재시도하지 않음)
+GET_RETRIES = int(os.getenv("API_GET_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.3"))
+MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "8"))
+TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+
+# GET 응답을 ETag와 함께 보관해 두었다가 If-None-Match로 재검증 (304면 본문 재사용)
+# Streamlit은 rerun마다 ApiClient를 새로 만들므로 모듈 단위로 공유
+ETAG_CACHE_SIZE = int(os.getenv("API_ETAG_CACHE_SIZE", "256"))
+_etag_cache: "OrderedDict[str, Tuple[str, Any, Mapping[str, str]]]" = OrderedDict()
+_etag_lock = threading.Lock()
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="api-client")
 
 
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=GET_RETRIES,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
 
 class ApiClient:
     def __init__(self, base_url: Optional[str] = None) -> None:
         self.base_url = (base_url or os.getenv("API_BASE_URL") or "http://127.0.0.1:8000").rstrip(
             "/"
         )
+        # 이 클라이언트가 보낸 요청별 소요 시간 (진단용)
+        self.timings: List[Dict[str, Any]] = []
+        self._timings_lock = threading.Lock()
+
+    def fetch_many(self, calls: Iterable[Callable[[], T]]) -> List[T]:
+        """Run independent calls (e.g. lambda: client.average_rating(1)) concurrently; results keep call order."""
+        futures = [_executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def timing_summary(self) -> Dict[str, Any]:
+        with self._timings_lock:
+            timings = list(self.timings)
+        return {
+            "calls": len(timings),
+            "total_ms": sum(t["ms"] for t in timings),
+            "not_modified": sum(1 for t in timings if t["status"] == 304),
+            "slowest": sorted(timings, key=lambda t: t["ms"], reverse=True)[:5],
+        }
+
+    def _record(self, method: str, path: str, status: Optional[int], started: float) -> None:
+        entry = {"method": method.upper(), "path": path, "status": status, "ms": (time.perf_counter() - started) * 1000}
+        with self._timings_lock:
+            self.timings.append(entry)
 
     def _request(self, method: str, path: str, **kwargs: Any) -> Tuple[Optional[Any], Optional[str]]:
+        data, err, _ = self._request_full(method, path, **kwargs)
+        return data, err
+
+    def _request_full(
+        self, method: str, path: str, **kwargs: Any
+    ) -> Tuple[Optional[Any], Optional[str], Mapping[str, str]]:
+        """Like _request, but also returns the response headers (e.g. X-Next-Cursor)."""
         url = f"{self.base_url}{path}"
+        cache_key = None
+        cached = None
+        if method.lower() == "get":
+            cache_key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+            with _etag_lock:
+                cached = _etag_cache.get(cache_key)
+            if cached:
+                kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": cached[0]}
+        started = time.perf_counter()
         try:
-            resp = requests.request(method, url, timeout=10, **kwargs)
+            resp = _get_session().request(method, url, timeout=TIMEOUT, **kwargs)
+            self._record(method, path, resp.status_code, started)
+            if resp.status_code == 304 and cached:
+                return cached[1], None, cached[2]
+            if resp.ok and cache_key and resp.headers.get("ETag") and resp.text:
+                data = resp.json()
+                with _etag_lock:
+                    _etag_cache[cache_key] = (resp.headers["ETag"], data, resp.headers)
+                    _etag_cache.move_to_end(cache_key)
+                    while len(_etag_cache) > ETAG_CACHE_SIZE:
+                        _etag_cache.popitem(last=False)
+                return data, None, resp.headers
             if resp.ok:
                 # 빈 본문이거나 JSON이 아닌 경우도 대비
                 if resp.text:
-                    return resp.json(), None
-                return {}, None
-            return None, f"{resp.status_code}: {resp.text}"
+                    return resp.json(), None, resp.headers
+                return {}, None, resp.headers
+            return None, f"{resp.status_code}: {resp.text}", resp.headers
         except Exception as e:  # noqa: BLE001
-            return None, str(e)
+            self._record(method, path, None, started)
+            return None, str(e), {}
+
+    def _page(self, path: str, cursor: Optional[str], page_size: Optional[int], **params: Any):
+        if cursor:
+            params["cursor"] = cursor
+        if page_size is not None:
+            params["page_size"] = page_size
+        data, err, headers = self._request_full("get", path, params=params)
+        if err:
+            return None, err
+        return {"items": data, "next_cursor": headers.get("X-Next-Cursor")}, None
 
     # Movies
     def list_movies(self) -> Tuple[Optional[Any], Optional[str]]:
-        return self._request("get", "/movies/")
+        """All movies, following the cursor through every page."""
+        movies, cursor = [], None
+        while True:
+            page, err = self._page("/movies/", cursor, page_size=500)
+            if err:
+                return None, err
+            movies.extend(page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                return movies, None
+
+    def movies_summary(
+        self, reviews_per_movie: int = 3, ids: Optional[List[int]] = None
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """The given movies with average rating and latest reviews in one request."""
+        params: Dict[str, Any] = {"reviews_per_movie": reviews_per_movie}
+        if ids is not None:
+            params["ids"] = ids
+            params["page_size"] = max(1, len(ids))
+        return self._request("get", "/movies/summary", params=params)
+
+    def movies_summary_page(
+        self, cursor: Optional[str] = None, page_size: int = 30, reviews_per_movie: int = 3
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """One page of movie summaries: {"items": [...], "next_cursor": str | None}."""
+        return self._page("/movies/summary", cursor, page_size, reviews_per_movie=reviews_per_movie)
+
+    # Search
+    def search(self, query: str, kind: str = "all", limit: int = 20) -> Tuple[Optional[Any], Optional[str]]:
+        """Ranked {"movies": [{"score", "item"}], "reviews": [...]} from the server-side index."""
+        return self._request("get", "/search/", params={"q": query, "kind": kind, "limit": limit})
+
+    def poster_url(self, movie: Dict[str, Any], width: int = 400) -> Optional[str]:
+        """Backend thumbnail URL for a movie's poster, or None when it has none.
+
+        v (hash of poster_url) changes with the poster, so the long-lived browser cache never goes stale.
+        """
+        if not movie.get("poster_url"):
+            return None
+        version = hashlib.sha1(movie["poster_url"].encode()).hexdigest()[:10]
+        return f"{self.base_url}/movies/{movie['id']}/poster?w={width}&v={version}"
 
     def create_movie(self, payload: Dict[str, Any]) -> Tuple[Optional[Any], Optional[str]]:
         return self._request("post", "/movies/", json=payload)
@@ -33,6 +181,10 @@ class ApiClient:
     def delete_movie(self, movie_id: int) -> Tuple[Optional[Any], Optional[str]]:
         return self._request("delete", f"/movies/{movie_id}/")
 
+    def delete_movies(self, movie_ids: List[int]) -> Tuple[Optional[Any], Optional[str]]:
+        """{"deleted": [...], "missing": [...]}"""
+        return self._request("delete", "/movies/", params={"ids": movie_ids})
+
     # Reviews
     def list_reviews(self) -> Tuple[Optional[Any], Optional[str]]:
         return self._request("get", "/reviews/")
@@ -41,8 +193,18 @@ class ApiClient:
         params = {"limit": limit} if limit is not None else {}
         return self._request("get", f"/reviews/movie/{movie_id}/", params=params)
 
+    def list_reviews_by_movie_page(
+        self, movie_id: int, cursor: Optional[str] = None, page_size: int = 20
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """One page of a movie's reviews: {"items": [...], "next_cursor": str | None}."""
+        return self._page(f"/reviews/movie/{movie_id}/", cursor, page_size)
+
     def create_review(self, payload: Dict[str, Any]) -> Tuple[Optional[Any], Optional[str]]:
         return self._request("post", "/reviews/", json=payload)
 
     def average_rating(self, movie_id: int) -> Tuple[Optional[Any], Optional[str]]:
         return self._request("get", f"/reviews/movie/{movie_id}/rating/")
+
+    def movie_trend(self, movie_id: int, bucket: str = "week") -> Tuple[Optional[Any], Optional[str]]:
+        """{"bucket", "points": [{"start", "review_count", "average_sentiment", "label_counts"}]}"""
+        return self._request("get", f"/reviews/movie/{movie_id}/trend/", params={"bucket": bucket})
@@ -2,9 +2,13 @@ import streamlit as st
 import time
 
 from api_client import ApiClient
+from cached_client import CachedApiClient
 
 st.set_page_config(page_title="Movies & Reviews", layout="wide")
 
+# 메인 그리드 한 페이지당 영화 수 (3열)
+GRID_PAGE_SIZE = 30
+
 # CSS for fixed image height and card styling
 st.markdown("""
 <style>
@@ -27,7 +31,8 @@ st.sidebar.header("백엔드 설정")
 default_base = st.session_state.get("api_base_url", "https://geundol222-movie-review.hf.space")
 api_base_url = st.sidebar.text_input("API Base URL", value=default_base)
 st.session_state["api_base_url"] = api_base_url
-client = ApiClient(api_base_url)
+# 읽기 요청은 Streamlit 캐시를 거치고, 이 세션의 쓰기가 관련 캐시만 무효화
+client = CachedApiClient(ApiClient(api_base_url))
 
 # 페이지 상태 관리
 if "current_page" not in st.session_state:
@@ -38,6 +43,8 @@ if "selected_movie" not in st.session_state:
 
 def go_to_reviews(movie):
     """리뷰 상세 페이지로 이동"""
+    # 상세 페이지에 들어올 때마다 첫 페이지부터 다시 불러오기
+    st.session_state.pop(f"reviews-{movie['id']}", None)
     st.session_state["current_page"] = "reviews"
     st.session_state["selected_movie"] = movie
     st.rerun()
@@ -61,10 +68,23 @@ if st.session_state["current_page"] == "reviews":
 
     st.divider()
 
+    # 평점, 감성 추이, 첫 리뷰 페이지는 서로 독립적이므로 동시에 요청
+    bucket_labels = {"일별": "day", "주별": "week", "월별": "month"}
+    bucket = bucket_labels[st.session_state.get("trend_bucket", "주별")]
+    loaded_key = f"reviews-{movie['id']}"
+    calls = [
+        lambda: client.average_rating(movie["id"]),
+        lambda: client.movie_trend(movie["id"], bucket=bucket),
+    ]
+    if loaded_key not in st.session_state:
+        calls.append(lambda: client.list_reviews_by_movie_page(movie["id"]))
+    (rating, r_err), (trend, t_err), *first_page = client.fetch_many(calls)
+
     # 영화 정보 표시
     col1, col2 = st.columns([1, 2])
     with col1:
-        poster = movie.get("poster_url")
+        # 원본 대신 백엔드에서 리사이즈·캐시한 썸네일 사용
+        poster = client.poster_url(movie)
         if poster:
             try:
                 st.image(poster, width=300)
@@ -87,20 +107,59 @@ if st.session_state["current_page"] == "reviews":
             st.write(item)
 
         # 평균 평점
-        rating, r_err = client.average_rating(movie["id"])
-        if not r_err:
+        if r_err:
+            st.error(f"평점 불러오기 실패: {r_err}")
+        elif rating is None:
+            st.info("아직 리뷰가 없습니다")
+        else:
             st.success(f"⭐ 평균 감성 점수: {rating.get('average_sentiment'):.3f}")
+            counts = rating.get("label_counts") or {}
+            if counts:
+                st.caption(
+                    f"리뷰 {rating.get('review_count', 0)}개 · 긍정 {counts.get('positive', 0)} · "
+                    f"중립 {counts.get('neutral', 0)} · 부정 {counts.get('negative', 0)}"
+                )
+
+    # 감성 추이 차트 (서버의 일별 집계 테이블에서 기간 단위로 합산)
+    st.radio("감성 추이", list(bucket_labels), index=1, horizontal=True, key="trend_bucket")
+    if t_err:
+        st.error(f"추이 불러오기 실패: {t_err}")
+    elif trend.get("points"):
+        points = trend["points"]
+        periods = [p["start"] for p in points]
+        chart_col1, chart_col2 = st.columns(2)
+        with chart_col1:
+            st.caption("평균 감성 점수")
+            st.line_chart({"기간": periods, "평균 점수": [p["average_sentiment"] for p in points]}, x="기간")
+        with chart_col2:
+            st.caption("리뷰 수 (레이블별)")
+            st.bar_chart(
+                {
+                    "기간": periods,
+                    "긍정": [p["label_counts"].get("positive", 0) for p in points],
+                    "중립": [p["label_counts"].get("neutral", 0) for p in points],
+                    "부정": [p["label_counts"].get("negative", 0) for p in points],
+                },
+                x="기간",
+            )
 
     st.divider()
 
-    # 전체 리뷰 표시
-    reviews, err = client.list_reviews_by_movie(movie["id"])
-    if err:
-        st.error(f"리뷰 불러오기 실패: {err}")
-    elif not reviews:
+    # 전체 리뷰 표시 (페이지 단위로 이어서 불러오기)
+    if first_page:
+        page, err = first_page[0]
+        if err:
+            st.error(f"리뷰 불러오기 실패: {err}")
+            page = {"items": [], "next_cursor": None}
+        st.session_state[loaded_key] = page
+    loaded = st.session_state[loaded_key]
+    reviews = loaded["items"]
+
+    if not reviews:
         st.info("리뷰가 없습니다.")
     else:
-        st.subheader(f"전체 리뷰 ({len(reviews)}개)")
+        more = "+" if loaded["next_cursor"] else ""
+        st.subheader(f"전체 리뷰 ({len(reviews)}{more}개)")
         for idx, review in enumerate(reviews, 1):
             with st.container(border=True):
                 col_a, col_b = st.columns([3, 1])
@@ -113,6 +172,15 @@ if st.session_state["current_page"] == "reviews":
                 st.write(review.get('content'))
                 st.caption(f"등록일: {review.get('created_at')}")
 
+        if loaded["next_cursor"] and st.button("리뷰 더 보기", use_container_width=True):
+            page, err = client.list_reviews_by_movie_page(movie["id"], cursor=loaded["next_cursor"])
+            if err:
+                st.error(f"리뷰 불러오기 실패: {err}")
+            else:
+                loaded["items"] = reviews + page["items"]
+                loaded["next_cursor"] = page["next_cursor"]
+                st.rerun()
+
 # 메인 페이지
 else:
     st.title("🎬 영화 & 리뷰")
@@ -125,29 +193,46 @@ else:
         st.header("영화 목록")
 
         # 검색 기능
-        search_query = st.text_input("search", placeholder="🔍 영화 검색 (제목, 감독, 장르)", label_visibility="collapsed")
-
-        movies, err = client.list_movies()
+        search_query = st.text_input(
+            "search", placeholder="🔍 영화·리뷰 검색 (제목, 감독, 장르, 리뷰 내용)", label_visibility="collapsed"
+        )
+
+        review_hits = []
+        cursor = None
+        if search_query:
+            # 서버 검색 인덱스에서 순위가 매겨진 영화 id를 받은 뒤 해당 영화만 요약 조회
+            movies = []
+            results, err = client.search(search_query, limit=30)
+            if not err:
+                review_hits = results.get("reviews", [])
+                ranked_ids = [hit["item"]["id"] for hit in results.get("movies", [])]
+                if ranked_ids:
+                    summaries, err = client.movies_summary(reviews_per_movie=3, ids=ranked_ids)
+                    if not err:
+                        by_id = {m["id"]: m for m in summaries}
+                        movies = [by_id[i] for i in ranked_ids if i in by_id]
+        else:
+            # 평점과 최근 리뷰 3개까지 페이지 단위로 조회 ("더 보기"로 다음 페이지)
+            movies, cursor = [], None
+            for _ in range(st.session_state.setdefault("grid_pages", 1)):
+                page, err = client.movies_summary_page(cursor=cursor, page_size=GRID_PAGE_SIZE, reviews_per_movie=3)
+                if err:
+                    break
+                movies.extend(page["items"])
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
         if err:
             st.error(f"영화 목록 불러오기 실패: {err}")
         else:
-            if not movies:
+            if not movies and not search_query:
                 st.info("등록된 영화가 없습니다.")
             else:
-                # 검색 필터링
-                if search_query:
-                    search_lower = search_query.lower()
-                    filtered_movies = [
-                        m for m in movies
-                        if search_lower in str(m.get('title', '')).lower()
-                        or search_lower in str(m.get('director', '')).lower()
-                        or search_lower in str(m.get('genre', '')).lower()
-                    ]
-                else:
-                    filtered_movies = movies
+                filtered_movies = movies
 
                 if not filtered_movies:
-                    st.warning(f"'{search_query}'에 대한 검색 결과가 없습니다.")
+                    if not review_hits:
+                        st.warning(f"'{search_query}'에 대한 검색 결과가 없습니다.")
                 else:
                     # 3개 컬럼 고정
                     cols = st.columns(3)
@@ -155,8 +240,8 @@ else:
                     for idx, movie in enumerate(filtered_movies):
                         col = cols[idx % 3]
                         with col:
-                                # 포스터 - 고정 크기
-                                poster = movie.get("poster_url")
+                                # 포스터 - 고정 크기 (백엔드 썸네일)
+                                poster = client.poster_url(movie)
                                 if poster:
                                     try:
                                         col.image(poster, use_container_width=True)
@@ -176,15 +261,14 @@ else:
                                     col.caption(meta)
 
                                 # 평균 평점
-                                rating, r_err = client.average_rating(movie["id"])
-                                if r_err:
+                                if movie.get("average_sentiment") is None:
                                     col.info("리뷰 없음")
                                 else:
-                                    col.success(f"⭐ 평균 점수: {rating.get('average_sentiment'):.3f}")
+                                    col.success(f"⭐ 평균 점수: {movie.get('average_sentiment'):.3f}")
 
                                 # 최근 리뷰 3개
-                                reviews, rv_err = client.list_reviews_by_movie(movie["id"], limit=3)
-                                if not rv_err and reviews:
+                                reviews = movie.get("recent_reviews") or []
+                                if reviews:
                                     col.markdown("**최근 리뷰**")
                                     for review in reviews:
                                         with col.expander(f"{review.get('author')} - {review.get('sentiment_label')}"):
@@ -205,6 +289,20 @@ else:
                                         st.success("삭제 완료")
                                         st.rerun()
 
+        if not search_query and cursor and st.button("영화 더 보기", use_container_width=True):
+            st.session_state["grid_pages"] += 1
+            st.rerun()
+
+        # 리뷰 내용 검색 결과
+        if review_hits:
+            st.subheader(f"리뷰 검색 결과 ({len(review_hits)}개)")
+            for hit in review_hits:
+                review = hit["item"]
+                with st.container(border=True):
+                    st.markdown(f"**{review.get('author')}** · {review.get('sentiment_label')}")
+                    st.write(review.get("content"))
+                    st.caption(f"등록일: {review.get('created_at')}")
+
     # 탭 2: 영화 등록
     with tab_add_movie:
         st.header("영화 등록")
@@ -267,6 +365,9 @@ else:
                         review, err = client.create_review(payload)
                         if err:
                             st.error(f"리뷰 등록 실패: {err}")
+                        elif review and review.get("sentiment_status") == "pending":
+                            st.success("✅ 리뷰 등록 완료! 감성 점수는 잠시 후 반영됩니다.")
+                            st.rerun()
                         elif review:
                             st.success(
                                 f"✅ 리뷰 등록 완료!\n\n"
@@ -277,3 +378,10 @@ else:
                             st.rerun()
                         else:
                             st.error("리뷰 등록 실패: 응답이 없습니다.")
+
+# 사이드바: 이번 rerun의 API 호출 진단
+timing = client.timing_summary()
+with st.sidebar.expander(f"API 호출 {timing['calls']}건 · {timing['total_ms']:.0f}ms"):
+    st.caption(f"304 재사용 {timing['not_modified']}건")
+    for t in timing["slowest"]:
+        st.text(f"{t['ms']:7.1f}ms {t['status']} {t['method']} {t['path']}")
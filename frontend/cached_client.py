@@ -0,0 +1,195 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from api_client import ApiClient
+
+T = TypeVar("T")
+
+# 다른 세션에서 바뀐 데이터는 최대 이 시간(초) 뒤에 반영됨
+CACHE_TTL = int(os.getenv("FRONTEND_CACHE_TTL", "60"))
+
+
+class _ApiError(Exception):
+    """실패한 응답은 캐시하지 않도록 예외로 빠져나감"""
+
+
+def _unwrap(result: Tuple[Optional[Any], Optional[str]]) -> Any:
+    data, err = result
+    if err:
+        raise _ApiError(err)
+    return data
+
+
+# `_client`는 밑줄로 시작하므로 캐시 키에서 제외되고, base_url과 version이 키 역할을 함
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _list_movies(_client: ApiClient, base_url: str, version: int):
+    return _unwrap(_client.list_movies())
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _movies_summary(_client: ApiClient, base_url: str, version: int, reviews_per_movie: int, ids):
+    return _unwrap(_client.movies_summary(reviews_per_movie=reviews_per_movie, ids=ids))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _movies_summary_page(
+    _client: ApiClient, base_url: str, version: int, cursor, page_size: int, reviews_per_movie: int
+):
+    return _unwrap(_client.movies_summary_page(cursor=cursor, page_size=page_size, reviews_per_movie=reviews_per_movie))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _search(_client: ApiClient, base_url: str, version: int, query: str, kind: str, limit: int):
+    return _unwrap(_client.search(query, kind=kind, limit=limit))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _average_rating(_client: ApiClient, base_url: str, version: int, movie_id: int):
+    rating, err = _client.average_rating(movie_id)
+    # 리뷰가 없는 영화(404)도 정상 결과로 캐시해서 다시 그릴 때마다 요청하지 않음
+    if err and err.startswith("404"):
+        return None
+    return _unwrap((rating, err))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _movie_trend(_client: ApiClient, base_url: str, version: int, movie_id: int, bucket: str):
+    return _unwrap(_client.movie_trend(movie_id, bucket=bucket))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _reviews_page(_client: ApiClient, base_url: str, version: int, movie_id: int, cursor, page_size: int):
+    return _unwrap(_client.list_reviews_by_movie_page(movie_id, cursor=cursor, page_size=page_size))
+
+
+class _Versions:
+    """Version counters per (base_url, key), shared by every session like the st.cache_data entries they key."""
+
+    def __init__(self) -> None:
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url: str, key: str) -> int:
+        with self._lock:
+            return self._counts.get((base_url, key), 0)
+
+    def bump(self, base_url: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._counts[(base_url, key)] = self._counts.get((base_url, key), 0) + 1
+
+
+@st.cache_resource
+def _shared_versions() -> _Versions:
+    return _Versions()
+
+
+class CachedApiClient:
+    """ApiClient with Streamlit-cached reads.
+
+    Each read is keyed by a version counter shared by all sessions (the cache
+    itself is shared too, so per-session counters would collide); writes bump
+    exactly the versions they affect, so the next rerun of any session refetches
+    only that data. Changes made outside this app show up after CACHE_TTL.
+    Version keys: "movies" (movie list), "summary" (grid and search, changed by
+    any write) and "movie:<id>" (one movie's rating, trend and reviews).
+    """
+
+    def __init__(self, client: ApiClient) -> None:
+        self.client = client
+        self.base_url = client.base_url
+        # 작업 스레드에서도 읽을 수 있도록 공유 저장소를 직접 잡아 둠
+        self._versions = _shared_versions()
+
+    def _version(self, key: str) -> int:
+        return self._versions.get(self.base_url, key)
+
+    def _bump(self, *keys: str) -> None:
+        self._versions.bump(self.base_url, keys)
+
+    @staticmethod
+    def _call(fn: Callable[..., Any], *args: Any) -> Tuple[Optional[Any], Optional[str]]:
+        try:
+            return fn(*args), None
+        except _ApiError as e:
+            return None, str(e)
+
+    # 진단 / 동시 요청은 원래 클라이언트에 위임
+    def timing_summary(self) -> Dict[str, Any]:
+        return self.client.timing_summary()
+
+    def fetch_many(self, calls: Iterable[Callable[[], T]]) -> List[T]:
+        # 캐시 함수가 작업 스레드에서도 현재 세션 컨텍스트로 동작하도록 연결
+        ctx = get_script_run_ctx()
+
+        def with_ctx(call: Callable[[], T]) -> Callable[[], T]:
+            def run() -> T:
+                add_script_run_ctx(ctx=ctx)
+                return call()
+
+            return run
+
+        return self.client.fetch_many(with_ctx(call) for call in calls)
+
+    def poster_url(self, movie: Dict[str, Any], width: int = 400) -> Optional[str]:
+        return self.client.poster_url(movie, width)
+
+    # Reads
+    def list_movies(self):
+        return self._call(_list_movies, self.client, self.base_url, self._version("movies"))
+
+    def movies_summary(self, reviews_per_movie: int = 3, ids: Optional[List[int]] = None):
+        return self._call(
+            _movies_summary, self.client, self.base_url, self._version("summary"), reviews_per_movie, ids
+        )
+
+    def movies_summary_page(self, cursor: Optional[str] = None, page_size: int = 30, reviews_per_movie: int = 3):
+        return self._call(
+            _movies_summary_page,
+            self.client,
+            self.base_url,
+            self._version("summary"),
+            cursor,
+            page_size,
+            reviews_per_movie,
+        )
+
+    def search(self, query: str, kind: str = "all", limit: int = 20):
+        return self._call(_search, self.client, self.base_url, self._version("summary"), query, kind, limit)
+
+    def average_rating(self, movie_id: int):
+        """(None, None) when the movie has no reviews yet."""
+        return self._call(_average_rating, self.client, self.base_url, self._version(f"movie:{movie_id}"), movie_id)
+
+    def movie_trend(self, movie_id: int, bucket: str = "week"):
+        return self._call(
+            _movie_trend, self.client, self.base_url, self._version(f"movie:{movie_id}"), movie_id, bucket
+        )
+
+    def list_reviews_by_movie_page(self, movie_id: int, cursor: Optional[str] = None, page_size: int = 20):
+        return self._call(
+            _reviews_page, self.client, self.base_url, self._version(f"movie:{movie_id}"), movie_id, cursor, page_size
+        )
+
+    # Writes: 성공하면 영향을 받는 버전만 올림
+    def create_movie(self, payload: Dict[str, Any]):
+        created, err = self.client.create_movie(payload)
+        if not err:
+            self._bump("movies", "summary")
+        return created, err
+
+    def delete_movie(self, movie_id: int):
+        result, err = self.client.delete_movie(movie_id)
+        if not err:
+            self._bump("movies", "summary", f"movie:{movie_id}")
+        return result, err
+
+    def create_review(self, payload: Dict[str, Any]):
+        review, err = self.client.create_review(payload)
+        if not err:
+            self._bump("summary", f"movie:{payload['movie_id']}")
+        return review, err
@@ -0,0 +1,82 @@
+"""Write-behind scoring: storing a batch copes with reviews deleted or reclaimed meanwhile.
+
+Run with: python -m unittest test_scoring_queue
+"""
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='test-scoring-')}/test.db"
+os.environ["SENTIMENT_CACHE_DB"] = ""
+
+from sqlalchemy import select  # noqa: E402
+
+from backend import models, scoring_queue, sentiment  # noqa: E402
+from backend.db import Movie, MovieStats, Review, ScoringJob, SessionLocal, init_db  # noqa: E402
+
+
+class ProcessBatchTest(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.db = SessionLocal()
+        movie = Movie(title="기생충", release_date=date(2019, 5, 30), director="봉준호", genre="드라마")
+        self.db.add(movie)
+        self.db.commit()
+        self.movie_id = movie.id
+        self.review_ids = [
+            scoring_queue.enqueue_review(
+                self.db, models.ReviewCreate(movie_id=movie.id, author="a", content=f"좋아요 {n}")
+            ).id
+            for n in range(3)
+        ]
+
+    def tearDown(self):
+        self.db.query(ScoringJob).delete()
+        self.db.commit()
+        self.db.close()
+
+    def test_batch_mates_complete(self):
+        deleted = self.review_ids[1]
+
+        def score_and_delete(texts):
+            # the review goes away after its job was claimed, as DELETE /reviews/{id} would do it
+            with SessionLocal() as other:
+                other.delete(other.get(Review, deleted))
+                other.commit()
+            return [(0.9, "positive")] * len(texts)
+
+        with mock.patch.object(sentiment, "analyze_batch", score_and_delete):
+            self.assertEqual(scoring_queue.process_batch(self.db), 3)
+
+        self.db.expire_all()
+        for review_id in self.review_ids:
+            review = self.db.get(Review, review_id)
+            if review_id == deleted:
+                self.assertIsNone(review)
+            else:
+                self.assertEqual((review.sentiment_status, review.sentiment_score), ("done", 0.9))
+        self.assertEqual(self.db.scalars(select(ScoringJob.id)).all(), [])
+        self.assertEqual(self.db.get(MovieStats, self.movie_id).review_count, 2)
+
+    def test_reclaimed_job_is_left_to_its_new_worker(self):
+        def score_after_reclaim(texts):
+            with SessionLocal() as other:
+                job = other.scalars(select(ScoringJob).where(ScoringJob.review_id == self.review_ids[0])).one()
+                job.claimed_at = job.claimed_at + scoring_queue.CLAIM_TIMEOUT
+                other.commit()
+            return [(0.9, "positive")] * len(texts)
+
+        with mock.patch.object(sentiment, "analyze_batch", score_after_reclaim):
+            scoring_queue.process_batch(self.db)
+
+        self.db.expire_all()
+        self.assertEqual(self.db.get(Review, self.review_ids[0]).sentiment_status, "pending")
+        self.assertEqual(self.db.get(Review, self.review_ids[2]).sentiment_status, "done")
+        self.assertEqual(self.db.scalars(select(ScoringJob.review_id)).all(), [self.review_ids[0]])
+        self.assertEqual(self.db.get(MovieStats, self.movie_id).review_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
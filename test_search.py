@@ -0,0 +1,69 @@
+"""Search: one-character queries match inside longer words, with FTS5 and the in-process index.
+
+Run with: python -m unittest test_search
+"""
+import os
+import tempfile
+import unittest
+from datetime import date
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='test-search-')}/test.db"
+os.environ["SENTIMENT_CACHE_DB"] = ""
+
+from sqlalchemy import text  # noqa: E402
+
+from backend import search  # noqa: E402
+from backend.db import Movie, SessionLocal, init_db  # noqa: E402
+
+QUERIES = {"봉": True, "준": True, "호": True, "충": True, "기생": True, "u": True, "up": True, "김": False}
+
+
+class OneCharacterQueryTest(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.db = SessionLocal()
+        self.movie = Movie(title="기생충 Up", release_date=date(2019, 5, 30), director="봉준호", genre="드라마")
+        self.db.add(self.movie)
+        self.db.flush()
+        self.reviews = [(1, self.movie.id, "봉준호 감독 최고"), (2, self.movie.id, "up and away")]
+
+    def tearDown(self):
+        self.db.rollback()
+        self.db.execute(text("DELETE FROM movies_fts"))
+        self.db.execute(text("DELETE FROM reviews_fts"))
+        self.db.query(Movie).delete()
+        self.db.commit()
+        self.db.close()
+
+    def _check(self, backend):
+        backend.add_movies(self.db, [self.movie])
+        backend.add_reviews(self.db, self.reviews)
+        for query, found in QUERIES.items():
+            with self.subTest(backend=type(backend).__name__, query=query):
+                movies = backend.search(self.db, "movies", search.ngrams(query), 10, 0)
+                self.assertEqual([movie_id for movie_id, _ in movies], [self.movie.id] if found else [])
+        reviews = backend.search(self.db, "reviews", search.ngrams("호"), 10, 0)
+        self.assertEqual([review_id for review_id, _ in reviews], [1])
+
+    def test_fts(self):
+        self.assertIsInstance(search._get_backend(self.db), search._FtsBackend)
+        self._check(search._FtsBackend())
+
+    def test_memory(self):
+        self._check(search._MemoryBackend())
+
+    def test_bigram_only_fts_index_is_rebuilt(self):
+        self.db.commit()
+        self.db.execute(text("DELETE FROM movies_fts"))
+        self.db.execute(
+            text("INSERT INTO movies_fts(rowid, title, director, genre) VALUES (:id, '기생 생충 up', '봉준 준호', '드라')"),
+            {"id": self.movie.id},
+        )
+        self.assertTrue(search._FtsBackend().needs_rebuild(self.db))
+        search.ensure_initialized(self.db)
+        self.assertFalse(search._FtsBackend().needs_rebuild(self.db))
+        self.assertEqual([movie_id for movie_id, _ in search.search(self.db, "봉", "movies", 10)], [self.movie.id])
+
+
+if __name__ == "__main__":
+    unittest.main()